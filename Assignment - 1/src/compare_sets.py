@@ -1,7 +1,65 @@
+import numpy as np
+
 class CompareSets:
     @staticmethod
     def jaccard_similarity(set1, set2):
         """Compute Jaccard Similarity between two sets."""
+        if isinstance(set1, np.ndarray):
+            return CompareSets._sorted_jaccard(set1, set2)
         intersection = len(set1.intersection(set2))
         union = len(set1.union(set2))
         return intersection / union if union != 0 else 0.0
+
+    @staticmethod
+    def _sorted_jaccard(array1, array2):
+        """Jaccard similarity of two sorted arrays of unique ids, via binary search instead of set objects."""
+        if len(array1) > len(array2):
+            array1, array2 = array2, array1
+        if len(array1) == 0:
+            return 0.0
+        positions = np.searchsorted(array2, array1).clip(max=len(array2) - 1)
+        intersection = int(np.count_nonzero(array2[positions] == array1))
+        return intersection / (len(array1) + len(array2) - intersection)
+
+    @staticmethod
+    def to_sorted_arrays(shingle_sets):
+        """
+        Convert shingle sets to sorted unique id arrays, one document at a time.
+        Integer arrays (rolling shingles) are used as they are; each MD5 hex string is reduced to
+        its first 64 bits as a uint64, so no corpus-wide vocabulary is built (a prefix collision
+        inside a corpus is about as likely as with 64-bit rolling shingles).
+        """
+        return [np.unique(shingles) if isinstance(shingles, np.ndarray) else CompareSets._md5_prefixes(shingles)
+                for shingles in shingle_sets]
+
+    @staticmethod
+    def _md5_prefixes(shingles):
+        """Sorted uint64 ids from a set of 32-digit MD5 hex strings (the big-endian first half of each digest)."""
+        digests = np.frombuffer(bytes.fromhex(''.join(shingles)), dtype='>u8')
+        return np.sort(digests[::2].astype(np.uint64))
+
+    @staticmethod
+    def iter_jaccard_blocks(shingle_sets, block_size=256):
+        """
+        Yield (row_start, col_start, block) tiles covering the upper triangle of the exact Jaccard
+        matrix, so callers can consume it without holding all n x n values.
+        """
+        arrays = CompareSets.to_sorted_arrays(shingle_sets)
+        n = len(arrays)
+        for row_start in range(0, n, block_size):
+            for col_start in range(row_start, n, block_size):
+                rows = range(row_start, min(row_start + block_size, n))
+                cols = range(col_start, min(col_start + block_size, n))
+                block = np.array([[CompareSets._sorted_jaccard(arrays[i], arrays[j]) for j in cols] for i in rows])
+                yield row_start, col_start, block
+
+    @staticmethod
+    def jaccard_matrix(shingle_sets, block_size=256):
+        """Compute the full symmetric (n x n) exact Jaccard similarity matrix."""
+        n = len(shingle_sets)
+        matrix = np.zeros((n, n))
+        for row_start, col_start, block in CompareSets.iter_jaccard_blocks(shingle_sets, block_size):
+            rows, cols = block.shape
+            matrix[row_start:row_start + rows, col_start:col_start + cols] = block
+            matrix[col_start:col_start + cols, row_start:row_start + rows] = block.T
+        return matrix
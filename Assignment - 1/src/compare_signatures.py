@@ -1,6 +1,63 @@
+import numpy as np
+
 class CompareSignatures:
     @staticmethod
     def signature_similarity(sig1, sig2):
         """Estimate similarity between two MinHash signatures."""
-        matches = sum(1 for i in range(len(sig1)) if sig1[i] == sig2[i])
-        return matches / len(sig1) if len(sig1) > 0 else 0.0
+        if len(sig1) == 0:
+            return 0.0
+        sig1 = np.asarray(sig1)
+        matches = np.count_nonzero(sig1 == np.asarray(sig2)) / len(sig1)
+        return float(CompareSignatures.correct_b_bit(matches, sig1.dtype))
+
+    @staticmethod
+    def correct_b_bit(match_rate, dtype):
+        """
+        Undo the chance collisions of b-bit signatures (uint8/uint16 components).
+        Two unrelated b-bit values still agree with probability 2**-b, so the observed match rate is
+        J + (1 - J) * 2**-b; full-width signatures are returned unchanged.
+        """
+        dtype = np.dtype(dtype)
+        if dtype.kind != 'u' or dtype.itemsize >= 4:
+            return match_rate
+        chance = 2.0 ** -(8 * dtype.itemsize)
+        return np.clip((match_rate - chance) / (1.0 - chance), 0.0, 1.0)
+
+    @staticmethod
+    def batch_similarity(signature, signatures):
+        """Estimate similarity between one signature and every row of a (n x num_hashes) matrix."""
+        signatures = np.asarray(signatures)
+        if signatures.shape[-1] == 0:
+            return np.zeros(len(signatures))
+        matches = (signatures == np.asarray(signature, dtype=signatures.dtype)).mean(axis=1)
+        return CompareSignatures.correct_b_bit(matches, signatures.dtype)
+
+    @staticmethod
+    def iter_similarity_blocks(signatures, block_size=256):
+        """
+        Yield (row_start, col_start, block) tiles covering the upper triangle of the signature
+        similarity matrix. Each tile broadcasts a (block x 1 x h) slab against a (1 x block x h) slab,
+        so peak memory is block_size**2 * num_hashes bytes whatever the number of documents.
+        """
+        signatures = np.asarray(signatures)
+        n, num_hashes = signatures.shape
+        for row_start in range(0, n, block_size):
+            rows = signatures[row_start:row_start + block_size]
+            for col_start in range(row_start, n, block_size):
+                cols = signatures[col_start:col_start + block_size]
+                matches = np.count_nonzero(rows[:, None, :] == cols[None, :, :], axis=2)
+                if num_hashes == 0:
+                    yield row_start, col_start, np.zeros(matches.shape)
+                    continue
+                yield row_start, col_start, CompareSignatures.correct_b_bit(matches / num_hashes, signatures.dtype)
+
+    @staticmethod
+    def similarity_matrix(signatures, block_size=256):
+        """Compute the full symmetric (n x n) estimated similarity matrix of stacked signatures."""
+        n = len(signatures)
+        matrix = np.zeros((n, n))
+        for row_start, col_start, block in CompareSignatures.iter_similarity_blocks(signatures, block_size):
+            rows, cols = block.shape
+            matrix[row_start:row_start + rows, col_start:col_start + cols] = block
+            matrix[col_start:col_start + cols, row_start:row_start + rows] = block.T
+        return matrix
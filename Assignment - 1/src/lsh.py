@@ -1,26 +1,74 @@
+import hashlib
+import random
 from collections import defaultdict
+import numpy as np
 
 class LSH:
     def __init__(self, num_bands=2, rows_per_band=50):
         self.num_bands = num_bands
         self.rows_per_band = rows_per_band
         self.buckets = defaultdict(list)
+        self.doc_keys = {}  # Document id -> its bucket key in every band
+        self.hot_buckets = {}  # Bucket key -> size of buckets capped by the last candidate scan
+
+    def band_keys(self, signature):
+        """Hash each band of a signature (with its band index) to a fixed-width 64-bit bucket key."""
+        bands = np.asarray(signature)
+        if bands.dtype.kind != 'u':
+            bands = bands.astype(np.uint32)  # Plain lists of ints; packed b-bit signatures keep their width
+        bands = bands[:self.num_bands * self.rows_per_band]
+        bands = bands.reshape(self.num_bands, self.rows_per_band)
+        keys = []
+        for i, band in enumerate(bands):
+            digest = hashlib.blake2b(band.tobytes(), digest_size=8, salt=i.to_bytes(8, 'little')).digest()
+            keys.append(int.from_bytes(digest, 'little'))
+        return keys
 
     def lsh_banding(self, signature, doc_id):
         """Place a document into LSH buckets based on its MinHash signature."""
-        for i in range(self.num_bands):
-            # Define the band as a tuple of rows within the band
-            band = tuple(signature[i * self.rows_per_band : (i + 1) * self.rows_per_band])
-            # Hash the band and use it as a bucket key
-            self.buckets[band].append(doc_id)
+        keys = self.band_keys(signature)
+        self.doc_keys[doc_id] = keys
+        for key in keys:
+            self.buckets[key].append(doc_id)
 
-    def get_candidate_pairs(self):
+    def get_candidate_pairs(self, max_bucket_size=None, sample=False, seed=42):
         """Retrieve candidate pairs from LSH buckets."""
-        candidates = set()
-        for band, docs in self.buckets.items():
-            if len(docs) > 1:
-                # Generate all unique pairs within the same bucket
-                for i in range(len(docs)):
-                    for j in range(i + 1, len(docs)):
-                        candidates.add((docs[i], docs[j]))
-        return candidates
+        return set(self.iter_candidate_pairs(max_bucket_size, sample, seed))
+
+    def iter_candidate_pairs(self, max_bucket_size=None, sample=False, seed=42):
+        """
+        Yield each candidate pair exactly once, bucket by bucket.
+        A pair is emitted only from the first band whose bucket emits it, which is checked against
+        the documents' stored band keys, so no set of seen pairs is kept.
+        Buckets larger than max_bucket_size (e.g. boilerplate shared by many documents) are recorded
+        in self.hot_buckets and either skipped or, with sample=True, reduced to a seeded random
+        sample of max_bucket_size documents.
+        """
+        rng = random.Random(seed)
+        self.hot_buckets = {}
+        samples = {}  # Hot bucket key -> documents kept from it (empty when skipped)
+        if max_bucket_size is not None:
+            for key, docs in self.buckets.items():
+                if len(docs) > max_bucket_size:
+                    self.hot_buckets[key] = len(docs)
+                    kept = sorted(rng.sample(range(len(docs)), max_bucket_size)) if sample else []
+                    samples[key] = {docs[i] for i in kept}
+
+        for key, docs in self.buckets.items():
+            if key in samples:
+                docs = [doc_id for doc_id in docs if doc_id in samples[key]]
+            if len(docs) < 2:
+                continue
+            band = self.doc_keys[docs[0]].index(key)
+            earlier = np.array([self.doc_keys[doc_id][:band] for doc_id in docs], dtype=np.uint64)
+            earlier = earlier.reshape(len(docs), band)
+            for i in range(len(docs) - 1):
+                # Earlier bands this document shares with each later member of the bucket
+                shared = earlier[i + 1:] == earlier[i]
+                for j, earlier_key in enumerate(self.doc_keys[docs[i]][:band]):
+                    if earlier_key in samples:
+                        kept = samples[earlier_key]
+                        emitted = [docs[i] in kept and doc_id in kept for doc_id in docs[i + 1:]]
+                        shared[:, j] &= np.array(emitted, dtype=bool)
+                for j in np.flatnonzero(~shared.any(axis=1)).tolist():
+                    yield docs[i], docs[i + 1 + j]
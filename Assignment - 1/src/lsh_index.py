@@ -0,0 +1,174 @@
+import json
+import os
+import numpy as np
+from lsh import LSH
+from compare_sets import CompareSets
+from compare_signatures import CompareSignatures
+
+class LSHIndex(LSH):
+    """
+    LSH index persisted to a directory so a growing corpus can be updated without re-signing it.
+
+    Layout:
+      meta.json        - band configuration, signature length and component dtype
+      doc_ids.json     - row -> document id table (null for removed rows)
+      signatures.bin   - append-only (rows x num_hashes) matrix of uint32 (or packed b-bit uint8/uint16)
+                         components, memory-mapped for reads
+      band_keys.u64    - append-only (rows x num_bands) uint64 bucket keys, used to rebuild buckets
+    """
+    def __init__(self, path, num_bands=2, rows_per_band=50, num_hashes=None, dtype=np.uint32):
+        super().__init__(num_bands, rows_per_band)
+        self.path = path
+        self.num_hashes = num_hashes or num_bands * rows_per_band
+        self.dtype = np.dtype(dtype)
+        self.doc_ids = []  # Row -> document id (None once removed)
+        self.rows = {}  # Document id -> row
+        self._signatures = None  # Cached memory map, dropped whenever rows are appended
+        os.makedirs(path, exist_ok=True)
+        if os.path.exists(self._file('meta.json')):
+            self._load()
+        else:
+            self.save()
+
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    def _load(self):
+        """Read the stored configuration and doc-id table and rebuild buckets from stored keys."""
+        with open(self._file('meta.json')) as file:
+            meta = json.load(file)
+        self.num_bands = meta['num_bands']
+        self.rows_per_band = meta['rows_per_band']
+        self.num_hashes = meta['num_hashes']
+        self.dtype = np.dtype(meta.get('dtype', 'uint32'))
+        with open(self._file('doc_ids.json')) as file:
+            self.doc_ids = json.load(file)
+        # Rows appended after the last save() have no doc id; drop them
+        self._truncate('signatures.bin', len(self.doc_ids) * self.num_hashes * self.dtype.itemsize)
+        self._truncate('band_keys.u64', len(self.doc_ids) * self.num_bands * 8)
+        keys = self._read_matrix('band_keys.u64', np.uint64, self.num_bands)
+        for row, doc_id in enumerate(self.doc_ids):
+            if doc_id is None:
+                continue
+            self.rows[doc_id] = row
+            self.doc_keys[doc_id] = keys[row].tolist()
+            for key in self.doc_keys[doc_id]:
+                self.buckets[key].append(doc_id)
+
+    def _truncate(self, name, size):
+        if os.path.exists(self._file(name)) and os.path.getsize(self._file(name)) > size:
+            os.truncate(self._file(name), size)
+
+    def _read_matrix(self, name, dtype, width):
+        rows = len(self.doc_ids)
+        if rows == 0:
+            return np.empty((0, width), dtype=dtype)
+        return np.memmap(self._file(name), dtype=dtype, mode='r', shape=(rows, width))
+
+    def save(self):
+        """Write the doc-id table and configuration; signature rows are already on disk."""
+        meta = {'num_bands': self.num_bands, 'rows_per_band': self.rows_per_band,
+                'num_hashes': self.num_hashes, 'dtype': self.dtype.name}
+        for name, content in (('meta.json', meta), ('doc_ids.json', self.doc_ids)):
+            tmp_file = self._file(name + '.tmp')
+            with open(tmp_file, 'w') as file:
+                json.dump(content, file)
+            os.replace(tmp_file, self._file(name))
+
+    def __contains__(self, doc_id):
+        return doc_id in self.rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def lsh_banding(self, signature, doc_id):
+        """Add a document to the buckets and append its signature to the on-disk store."""
+        self.add_document(doc_id, signature)
+
+    def add_document(self, doc_id, signature):
+        """Append one signed document; re-adding an existing id replaces its signature."""
+        if isinstance(signature, np.ndarray) and signature.dtype != self.dtype:
+            raise ValueError(f"Expected {self.dtype.name} signatures, got {signature.dtype.name}")
+        signature = np.asarray(signature, dtype=self.dtype)
+        if len(signature) != self.num_hashes:
+            raise ValueError(f"Expected a signature of length {self.num_hashes}, got {len(signature)}")
+        if doc_id in self.rows:
+            self.remove_document(doc_id)
+        keys = self.band_keys(signature)
+        with open(self._file('signatures.bin'), 'ab') as file:
+            file.write(signature.tobytes())
+        with open(self._file('band_keys.u64'), 'ab') as file:
+            file.write(np.array(keys, dtype=np.uint64).tobytes())
+        self.rows[doc_id] = len(self.doc_ids)
+        self.doc_ids.append(doc_id)
+        self._signatures = None
+        self.doc_keys[doc_id] = keys
+        for key in keys:
+            self.buckets[key].append(doc_id)
+
+    def remove_document(self, doc_id):
+        """Drop a document from the buckets and tombstone its row (reclaimed by compact())."""
+        row = self.rows.pop(doc_id)
+        self.doc_ids[row] = None
+        for key in self.doc_keys.pop(doc_id):
+            bucket = self.buckets[key]
+            bucket.remove(doc_id)
+            if not bucket:
+                del self.buckets[key]
+
+    @property
+    def signatures(self):
+        """Memory-mapped (rows x num_hashes) signature matrix, including removed rows."""
+        if self._signatures is None or len(self._signatures) != len(self.doc_ids):
+            self._signatures = self._read_matrix('signatures.bin', self.dtype, self.num_hashes)
+        return self._signatures
+
+    def get_signature(self, doc_id):
+        """Return the stored signature of a document."""
+        return self.signatures[self.rows[doc_id]]
+
+    def compact(self):
+        """
+        Rewrite the store without removed rows. The compacted files are written next to the
+        originals and swapped in with os.replace, so a failure part-way leaves the old store intact.
+        """
+        live = [row for row, doc_id in enumerate(self.doc_ids) if doc_id is not None]
+        signatures = np.array(self.signatures[live])
+        keys = np.array(self._read_matrix('band_keys.u64', np.uint64, self.num_bands)[live])
+        self._signatures = None
+        for name, matrix in (('signatures.bin', signatures), ('band_keys.u64', keys)):
+            matrix.tofile(self._file(name + '.tmp'))
+        for name in ('signatures.bin', 'band_keys.u64'):
+            os.replace(self._file(name + '.tmp'), self._file(name))
+        self.doc_ids = [self.doc_ids[row] for row in live]
+        self.rows = {doc_id: row for row, doc_id in enumerate(self.doc_ids)}
+        self.save()
+
+    def query(self, query, threshold=0.0, k=10, shingler=None, minhasher=None, load_shingles=None):
+        """
+        Find up to k near-duplicates of a signature or raw text, most similar first.
+        Only the query's own band buckets are probed; candidates are deduplicated and re-ranked by
+        estimated similarity in one vectorized comparison against their stored signatures.
+        :param query: MinHash signature, or document text (requires shingler and minhasher)
+        :param threshold: Minimum similarity for a result to be returned
+        :param load_shingles: Optional doc_id -> shingle set callable; when given with a text query,
+            the top results are verified and re-ranked by exact Jaccard similarity
+        :return: List of (doc_id, similarity) tuples
+        """
+        query_shingles = None
+        if isinstance(query, (str, bytes)):
+            if shingler is None or minhasher is None:
+                raise ValueError("Text queries need a shingler and a minhasher")
+            query_shingles = shingler.shingle_text(query)
+            query = minhasher.minhash_signature(query_shingles)
+        candidates = {doc_id for key in self.band_keys(query) for doc_id in self.buckets.get(key, ())}
+        if not candidates:
+            return []
+        candidates = sorted(candidates)
+        scores = CompareSignatures.batch_similarity(query, self.signatures[[self.rows[doc_id] for doc_id in candidates]])
+        ranked = sorted(zip(candidates, scores.tolist()), key=lambda result: -result[1])
+        if load_shingles is not None and query_shingles is not None:
+            ranked = [(doc_id, CompareSets.jaccard_similarity(query_shingles, load_shingles(doc_id)))
+                      for doc_id, _ in ranked[:k]]
+            ranked.sort(key=lambda result: -result[1])
+        return [(doc_id, similarity) for doc_id, similarity in ranked if similarity >= threshold][:k]
@@ -0,0 +1,71 @@
+from collections import namedtuple
+import numpy as np
+from compare_signatures import CompareSignatures
+
+LSHPlan = namedtuple('LSHPlan', ['num_bands', 'rows_per_band', 'num_hashes', 'false_positive', 'false_negative',
+                                 'within_budget'])
+
+def candidate_probability(similarity, num_bands, rows_per_band):
+    """Probability that two documents with the given Jaccard similarity share a bucket: 1-(1-s^r)^b."""
+    return 1.0 - (1.0 - np.asarray(similarity, dtype=float) ** rows_per_band) ** num_bands
+
+def error_rates(threshold, num_bands, rows_per_band, resolution=1000):
+    """
+    False-positive / false-negative rates of the S-curve around a similarity threshold.
+    False positives are the area under the curve below the threshold, false negatives the area
+    above the curve past the threshold; each is divided by its interval's width (threshold and
+    1 - threshold), giving the mean miss probability for similarities uniform on that interval.
+    """
+    below = np.linspace(0.0, threshold, resolution)
+    above = np.linspace(threshold, 1.0, resolution)
+    false_positive = _integrate(candidate_probability(below, num_bands, rows_per_band), below) / threshold
+    false_negative = _integrate(1.0 - candidate_probability(above, num_bands, rows_per_band), above) / (1.0 - threshold)
+    return false_positive, false_negative
+
+def _integrate(y, x):
+    """Trapezoidal rule."""
+    return float(np.sum((y[1:] + y[:-1]) * np.diff(x)) / 2)
+
+def plan_lsh(threshold, max_false_positive=0.1, max_false_negative=0.1, max_hashes=256,
+             false_positive_weight=0.5, false_negative_weight=0.5, min_hashes=100):
+    """
+    Choose (bands, rows, num_hashes) for a target Jaccard threshold.
+    Among layouts with min_hashes <= bands * rows <= max_hashes that meet both error budgets, the
+    cheapest (fewest hash functions, then lowest weighted error) is returned; if none meets the
+    budgets, the layout with the lowest weighted error is returned instead, with within_budget
+    False. The floor keeps the signatures long enough for their similarity estimates to be usable
+    (about 100 hashes give a standard error of 0.05). The default budgets can be met for
+    thresholds from 0.2 to 0.95 with 256 hashes; below that the false-negative rate stays higher.
+    """
+    if not 0.0 < threshold < 1.0:
+        raise ValueError("threshold must be between 0 and 1")
+    min_hashes = min(min_hashes, max_hashes)
+    best, best_within_budget = None, None
+    for num_bands in range(1, max_hashes + 1):
+        for rows_per_band in range(max(1, -(-min_hashes // num_bands)), max_hashes // num_bands + 1):
+            false_positive, false_negative = error_rates(threshold, num_bands, rows_per_band)
+            error = false_positive_weight * false_positive + false_negative_weight * false_negative
+            within_budget = false_positive <= max_false_positive and false_negative <= max_false_negative
+            plan = LSHPlan(num_bands, rows_per_band, num_bands * rows_per_band, false_positive, false_negative,
+                           within_budget)
+            if best is None or error < best[0]:
+                best = (error, plan)
+            if within_budget and (best_within_budget is None or (plan.num_hashes, error) < best_within_budget[0]):
+                best_within_budget = ((plan.num_hashes, error), plan)
+    return best_within_budget[1] if best_within_budget else best[1]
+
+def estimate_candidate_volume(sample_signatures, corpus_size, num_bands, rows_per_band):
+    """
+    Predict how many candidate pairs LSH will produce for a corpus from a sample of its signatures.
+    Pairwise similarities within the sample are estimated from the signatures, mapped through the
+    S-curve and scaled from the sample's pair count to the corpus's.
+    """
+    sample_signatures = np.asarray(sample_signatures)
+    n = len(sample_signatures)
+    if n < 2:
+        return 0.0
+    expected = 0.0
+    for i in range(n - 1):
+        similarities = CompareSignatures.batch_similarity(sample_signatures[i], sample_signatures[i + 1:])
+        expected += candidate_probability(similarities, num_bands, rows_per_band).sum()
+    return float(expected) * (corpus_size * (corpus_size - 1)) / (n * (n - 1))
@@ -1,21 +1,68 @@
 from shingling import Shingling
-from minhashing import MinHashing
+from minhashing import MinHashing, OnePermutationMinHashing
 from compare_sets import CompareSets
 from compare_signatures import CompareSignatures
 from lsh import LSH
+from lsh_index import LSHIndex
+from lsh_planner import plan_lsh, estimate_candidate_volume
+from signing import sign_corpus
+import argparse
 import os
+import random
+
+def main(data_path='data/', streaming=False, workers=None, chunksize=1, index_path=None, max_bucket_size=None,
+         threshold=None, one_permutation=False, b_bits=32):
+    num_bands, rows_per_band = 5, 20  # Adjusted LSH parameters for potential increased matches
+    if threshold is not None:
+        plan = plan_lsh(threshold)
+        num_bands, rows_per_band = plan.num_bands, plan.rows_per_band
+        print(f"LSH plan for threshold {threshold}: {num_bands} bands x {rows_per_band} rows "
+              f"(false positives {plan.false_positive:.4f}, false negatives {plan.false_negative:.4f})")
+        if not plan.within_budget:
+            print("Warning: no layout meets the error budgets; using the one with the lowest weighted error")
 
-def main():
     # Initialize components with adjusted parameters
     shingler = Shingling(k=10)
-    minhasher = MinHashing(num_hashes=100)
-    lsh = LSH(num_bands=5, rows_per_band=20)  # Adjusted LSH parameters for potential increased matches
+    lsh = LSH(num_bands=num_bands, rows_per_band=rows_per_band)
+    if index_path:
+        # Persistent index: only documents it hasn't seen are signed, so streaming is implied.
+        # An existing index keeps the band layout it was built with.
+        dtype = OnePermutationMinHashing.DTYPES[b_bits] if one_permutation else 'uint32'
+        lsh = LSHIndex(index_path, num_bands=num_bands, rows_per_band=rows_per_band, dtype=dtype)
+        streaming = True
+    minhasher = MinHashing(num_hashes=lsh.num_bands * lsh.rows_per_band)
+    if one_permutation:
+        # Single hash pass per document and packed b-bit components
+        minhasher = OnePermutationMinHashing(num_hashes=lsh.num_bands * lsh.rows_per_band, b_bits=b_bits)
 
-    data_path = 'data/'
     signatures = {}
     shingles = {}
     doc_names = []
 
+    if streaming:
+        # Stream each document straight into its signature across a process pool; shingle sets
+        # are never kept, so the exact Jaccard step is skipped
+        print("Streaming documents into MinHash signatures...")
+        filenames = os.listdir(data_path)
+        if index_path:
+            for doc_id in [doc_id for doc_id in lsh.rows if doc_id not in filenames]:
+                lsh.remove_document(doc_id)
+                print(f"{doc_id} - Removed from index.")
+            filenames = [filename for filename in filenames if filename not in lsh]
+        filepaths = [os.path.join(data_path, filename) for filename in filenames]
+        for filepath, signature in sign_corpus(filepaths, shingler, minhasher, workers, chunksize):
+            doc_id = os.path.basename(filepath)
+            signatures[doc_id] = signature
+            lsh.lsh_banding(signature, doc_id)
+            print(f"{doc_id} - MinHash signature generated.")
+        if index_path:
+            lsh.save()
+            print(f"Index at {index_path} holds {len(lsh)} documents.")
+            signatures = {doc_id: lsh.get_signature(doc_id) for doc_id in lsh.rows}
+        doc_names = sorted(signatures)
+        report_similarities(doc_names, signatures, lsh, max_bucket_size)
+        return
+
     # Step 1: Generate shingles for each document
     print("Generating shingles for each document...")
     for filename in os.listdir(data_path):
@@ -27,11 +74,10 @@ def main():
 
     # Step 2: Calculate Jaccard Similarity between each document pair
     print("\nJaccard Similarity between documents:")
+    jaccard = CompareSets.jaccard_matrix([shingles[doc] for doc in doc_names])
     for i in range(len(doc_names)):
         for j in range(i + 1, len(doc_names)):
-            doc1, doc2 = doc_names[i], doc_names[j]
-            similarity = CompareSets.jaccard_similarity(shingles[doc1], shingles[doc2])
-            print(f"Jaccard Similarity between {doc1} and {doc2}: {similarity:.4f}")
+            print(f"Jaccard Similarity between {doc_names[i]} and {doc_names[j]}: {jaccard[i, j]:.4f}")
 
     # Step 3: Generate MinHash signatures for each document
     print("\nGenerating MinHash signatures for each document...")
@@ -41,16 +87,24 @@ def main():
         lsh.lsh_banding(signature, doc_id)
         print(f"{doc_id} - MinHash signature generated.")
 
+    report_similarities(doc_names, signatures, lsh, max_bucket_size)
+
+def report_similarities(doc_names, signatures, lsh, max_bucket_size=None):
     # Step 4: Calculate Signature-Based Similarity between document pairs
     print("\nSignature Similarity between documents:")
+    similarity = CompareSignatures.similarity_matrix([signatures[doc] for doc in doc_names])
     for i in range(len(doc_names)):
         for j in range(i + 1, len(doc_names)):
-            doc1, doc2 = doc_names[i], doc_names[j]
-            similarity = CompareSignatures.signature_similarity(signatures[doc1], signatures[doc2])
-            print(f"Signature Similarity between {doc1} and {doc2}: {similarity:.4f}")
+            print(f"Signature Similarity between {doc_names[i]} and {doc_names[j]}: {similarity[i, j]:.4f}")
 
     # Step 5: Find Candidate Pairs using LSH
-    candidate_pairs = lsh.get_candidate_pairs()
+    sample = random.Random(42).sample(doc_names, min(len(doc_names), 200))
+    predicted = estimate_candidate_volume([signatures[doc] for doc in sample], len(doc_names),
+                                          lsh.num_bands, lsh.rows_per_band)
+    print(f"\nPredicted candidate pairs: {predicted:.1f}")
+    candidate_pairs = lsh.get_candidate_pairs(max_bucket_size, sample=True)
+    if lsh.hot_buckets:
+        print(f"\nSampled {len(lsh.hot_buckets)} hot buckets (largest holds {max(lsh.hot_buckets.values())} documents)")
     print("\nCandidate Pairs from LSH:")
     if candidate_pairs:
         for pair in candidate_pairs:
@@ -67,5 +121,25 @@ def main():
     else:
         print("No candidate pairs to calculate similarity for.")
 
+
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Find textually similar documents with MinHash and LSH.")
+    parser.add_argument("--data-path", default="data/", help="Directory of documents to compare")
+    parser.add_argument("--streaming", action="store_true",
+                        help="Sign documents chunk by chunk without keeping shingle sets (skips exact Jaccard)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes for streaming signing (default: all cores)")
+    parser.add_argument("--chunksize", type=int, default=1, help="Documents per worker task")
+    parser.add_argument("--index", default=None,
+                        help="Directory of a persistent LSH index to update incrementally (implies --streaming)")
+    parser.add_argument("--max-bucket-size", type=int, default=None,
+                        help="Sample LSH buckets larger than this when generating candidate pairs")
+    parser.add_argument("--threshold", type=float, default=None,
+                        help="Target Jaccard threshold; picks the LSH band layout and number of hashes")
+    parser.add_argument("--one-permutation", action="store_true",
+                        help="Use densified one-permutation MinHash instead of independent hash functions")
+    parser.add_argument("--b-bits", type=int, default=32, choices=(8, 16, 32),
+                        help="Bits stored per one-permutation signature component")
+    args = parser.parse_args()
+    main(args.data_path, args.streaming, args.workers, args.chunksize, args.index, args.max_bucket_size,
+         args.threshold, args.one_permutation, args.b_bits)
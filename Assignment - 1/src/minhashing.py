@@ -1,10 +1,15 @@
 import random
+import numpy as np
 
 class MinHashing:
-    def __init__(self, num_hashes=100):
+    def __init__(self, num_hashes=100, chunk_size=None):
         self.num_hashes = num_hashes
+        self.chunk_size = chunk_size  # Max shingles hashed at once (None = whole document)
         self.hash_functions = self._generate_hash_functions()
-    
+        # Coefficients as column vectors so every hash function is applied in one operation
+        self._a = np.array([a for a, _ in self.hash_functions], dtype=np.uint64).reshape(-1, 1)
+        self._b = np.array([b for _, b in self.hash_functions], dtype=np.uint64).reshape(-1, 1)
+
     def _generate_hash_functions(self):
         """Generate random hash functions for MinHashing."""
         max_shingle_id = 2**32 - 1
@@ -16,10 +21,112 @@ class MinHashing:
             hash_funcs.append((a, b))
         return hash_funcs
 
+    @staticmethod
+    def shingles_to_array(shingle_set, max_shingle=2**32 - 1):
+        """Convert hashed shingles to a uint64 array of shingle ids reduced modulo max_shingle."""
+        if isinstance(shingle_set, np.ndarray):
+            return shingle_set.astype(np.uint64) % np.uint64(max_shingle)
+        # Reducing each 128-bit hex id once keeps every later product inside 64 bits
+        return np.fromiter((int(shingle, 16) % max_shingle for shingle in shingle_set),
+                           dtype=np.uint64, count=len(shingle_set))
+
     def minhash_signature(self, shingle_set, max_shingle=2**32 - 1):
         """Generate a MinHash signature for the given shingle set."""
-        signature = []
-        for a, b in self.hash_functions:
-            min_hash = min((a * int(shingle, 16) + b) % max_shingle for shingle in shingle_set)
-            signature.append(min_hash)
+        if max_shingle > 2**32 - 1:
+            raise ValueError("max_shingle must fit in 32 bits for the vectorized hash")
+        shingle_ids = self.shingles_to_array(shingle_set, max_shingle)
+        if len(shingle_ids) == 0:
+            raise ValueError("Cannot compute a MinHash signature of an empty shingle set")
+        return self.minhash_array(shingle_ids, max_shingle)
+
+    def minhash_array(self, shingle_ids, max_shingle=2**32 - 1, signature=None):
+        """
+        Compute (or update) a signature from pre-reduced uint64 shingle ids.
+        All hash functions are evaluated as one (num_hashes x chunk) matrix; with chunk_size
+        set the shingles are processed in column blocks to cap peak memory.
+        """
+        modulus = np.uint64(max_shingle)
+        a = self._a % modulus
+        chunk_size = self.chunk_size or max(len(shingle_ids), 1)
+        for start in range(0, len(shingle_ids), chunk_size):
+            block = shingle_ids[start:start + chunk_size]
+            # a, x < 2**32 - 1, so a * x + b stays below 2**64 and matches the bignum result
+            block_min = ((a * block + self._b) % modulus).min(axis=1).astype(np.uint32)
+            signature = block_min if signature is None else np.minimum(signature, block_min)
+        return signature
+
+    def minhash_chunks(self, shingle_chunks, max_shingle=2**32 - 1):
+        """Fold a stream of shingle chunks into one signature without keeping the chunks."""
+        signature = None
+        for shingles in shingle_chunks:
+            shingle_ids = self.shingles_to_array(shingles, max_shingle)
+            if len(shingle_ids):
+                signature = self.minhash_array(shingle_ids, max_shingle, signature)
+        if signature is None:
+            raise ValueError("Cannot compute a MinHash signature of an empty shingle set")
+        return signature
+
+
+class OnePermutationMinHashing(MinHashing):
+    """
+    One-permutation MinHash: a single hash pass splits the shingles into num_hashes bins and keeps
+    each bin's minimum. Empty bins are filled by optimal densification (borrowing the value of a
+    non-empty bin chosen by a fixed per-bin probe sequence), and values are optionally truncated
+    to their lowest b_bits so a signature takes 1, 2 or 4 bytes per component.
+    """
+    EMPTY = np.uint64(2**64 - 1)
+    DTYPES = {8: np.uint8, 16: np.uint16, 32: np.uint32}
+
+    def __init__(self, num_hashes=100, b_bits=32, chunk_size=None):
+        if b_bits not in self.DTYPES:
+            raise ValueError("b_bits must be 8, 16 or 32")
+        self.b_bits = b_bits
+        self.dtype = self.DTYPES[b_bits]
+        super().__init__(num_hashes, chunk_size)
+
+    def minhash_signature(self, shingle_set, max_shingle=2**32 - 1):
+        """Generate a densified one-permutation signature for the given shingle set."""
+        return self.minhash_chunks([shingle_set], max_shingle)
+
+    def minhash_array(self, shingle_ids, max_shingle=2**32 - 1, signature=None):
+        """Compute (or update) the per-bin minima of pre-reduced uint64 shingle ids."""
+        modulus = np.uint64(max_shingle)
+        a, b = self._a[0] % modulus, self._b[0]
+        bin_minima = np.full(self.num_hashes, self.EMPTY) if signature is None else signature
+        chunk_size = self.chunk_size or max(len(shingle_ids), 1)
+        for start in range(0, len(shingle_ids), chunk_size):
+            hashes = (a * shingle_ids[start:start + chunk_size] + b) % modulus
+            # hashes < 2**32, so the product with num_hashes cannot overflow
+            bins = hashes * np.uint64(self.num_hashes) // modulus
+            np.minimum.at(bin_minima, bins.astype(np.intp), hashes)
+        return bin_minima
+
+    def minhash_chunks(self, shingle_chunks, max_shingle=2**32 - 1):
+        """Fold a stream of shingle chunks into per-bin minima, then densify and truncate once."""
+        bin_minima = None
+        for shingles in shingle_chunks:
+            shingle_ids = self.shingles_to_array(shingles, max_shingle)
+            if len(shingle_ids):
+                bin_minima = self.minhash_array(shingle_ids, max_shingle, bin_minima)
+        if bin_minima is None:
+            raise ValueError("Cannot compute a MinHash signature of an empty shingle set")
+        return self._densify(bin_minima).astype(self.dtype)
+
+    def _densify(self, bin_minima):
+        """Fill every empty bin from the first non-empty bin in its probe sequence."""
+        signature = bin_minima.copy()
+        pending = np.flatnonzero(bin_minima == self.EMPTY).astype(np.uint64)
+        attempt = 0
+        while pending.size:
+            attempt += 1
+            # Probe sequence depends only on (bin, attempt), so all documents borrow the same way
+            offset = np.uint64(attempt * 0xC2B2AE3D27D4EB4F % 2**64)
+            probe = pending * np.uint64(0x9E3779B97F4A7C15) + offset
+            probe ^= probe >> np.uint64(31)
+            probe *= np.uint64(0xBF58476D1CE4E5B9)
+            probe ^= probe >> np.uint64(29)
+            source = (probe % np.uint64(self.num_hashes)).astype(np.intp)
+            found = bin_minima[source] != self.EMPTY
+            signature[pending[found].astype(np.intp)] = bin_minima[source[found]]
+            pending = pending[~found]
         return signature
@@ -1,11 +1,43 @@
 import hashlib
+import mmap
+import os
+import zlib
+import numpy as np
 
 class Shingling:
-    def __init__(self, k=10):
-        self.k = k  # Length of each shingle (number of characters)
+    ROLLING_BASE = np.uint64(1099511628211)  # Odd multiplier for the polynomial (Rabin-Karp) hash
+
+    def __init__(self, k=10, method='md5', word_level=False, hash_bits=64):
+        self.k = k  # Length of each shingle (characters, or words when word_level is set)
+        self.method = method  # 'md5' (hex string set) or 'rolling' (integer array)
+        self.word_level = word_level
+        self.hash_bits = hash_bits  # Width of rolling shingle ids: 32 or 64
+        if method not in ('md5', 'rolling'):
+            raise ValueError(f"Unknown shingling method: {method}")
+        if hash_bits not in (32, 64):
+            raise ValueError("hash_bits must be 32 or 64")
+
+    @staticmethod
+    def prepare_text(text):
+        """Normalize raw text the way documents are read for MD5 shingling: lines joined by spaces."""
+        return text.replace('\r\n', '\n').replace('\r', '\n').replace('\n', ' ')
+
+    def shingle_text(self, text):
+        """Shingle raw text (str or bytes) exactly as process_document shingles a file with that content."""
+        if self.method == 'rolling':
+            return self.create_shingles(text)  # Rolling shingles hash the raw bytes and already treat '\n' as a space
+        if isinstance(text, bytes):
+            text = text.decode('utf-8', errors='ignore')
+        return self.create_shingles(self.prepare_text(text))
 
     def create_shingles(self, document):
         """Create shingles from a document and hash them."""
+        if self.word_level:
+            if isinstance(document, str):
+                document = document.encode('utf-8')
+            return self._shingle_words(document.split())
+        if self.method == 'rolling':
+            return self.create_rolling_shingles(document)
         shingles = set()
         for i in range(len(document) - self.k + 1):
             # Extract the k-length shingle
@@ -15,8 +47,108 @@ class Shingling:
             shingles.add(hashed_shingle)
         return shingles
 
+    def create_rolling_shingles(self, document):
+        """Hash every k-window with a rolling polynomial hash and return the sorted unique ids."""
+        if isinstance(document, str):
+            document = document.encode('utf-8')
+        if self.word_level:
+            return np.unique(self._rolling_hashes(self._word_symbols(document.split())))
+        symbols = np.frombuffer(document, dtype=np.uint8).astype(np.uint64)
+        symbols[symbols == ord('\n')] = ord(' ')
+        return np.unique(self._rolling_hashes(symbols))
+
+    def _shingle_words(self, words):
+        """Create shingles from k-word windows over a list of byte-string words."""
+        if self.method == 'rolling':
+            return np.unique(self._rolling_hashes(self._word_symbols(words)))
+        return {hashlib.md5(b' '.join(words[i:i + self.k])).hexdigest()
+                for i in range(len(words) - self.k + 1)}
+
+    @staticmethod
+    def _word_symbols(words):
+        """Map each word to a 32-bit token id so words can be hashed like characters."""
+        return np.fromiter((zlib.crc32(word) for word in words), dtype=np.uint64, count=len(words))
+
+    def _rolling_hashes(self, symbols):
+        """Polynomial hash of every k-window modulo 2**64, mixed and truncated to hash_bits."""
+        n = len(symbols) - self.k + 1
+        if n <= 0:
+            return np.empty(0, dtype=np.uint32 if self.hash_bits == 32 else np.uint64)
+        # Horner's rule across the k window offsets: k vector operations instead of n * k scalar ones
+        hashes = np.zeros(n, dtype=np.uint64)
+        for offset in range(self.k):
+            hashes = hashes * self.ROLLING_BASE + symbols[offset:offset + n]
+        # Avalanche the polynomial hash (MurmurHash3 finalizer) so the high bits are well mixed
+        hashes ^= hashes >> np.uint64(33)
+        hashes *= np.uint64(0xff51afd7ed558ccd)
+        hashes ^= hashes >> np.uint64(33)
+        if self.hash_bits == 32:
+            return (hashes >> np.uint64(32)).astype(np.uint32)
+        return hashes
+
     def process_document(self, filepath):
         """Read a document from a file, create shingles, and return hashed shingles."""
+        if self.method == 'rolling':
+            with open(filepath, 'rb') as file:
+                return self.create_rolling_shingles(file.read())
         with open(filepath, 'r', encoding='utf-8', errors='ignore') as file:
-            document = file.read().replace('\n', ' ')  # Combine lines into a single text block
-        return self.create_shingles(document)
+            document = file.read()
+        return self.create_shingles(self.prepare_text(document))
+
+    def iter_shingle_chunks(self, filepath, chunk_size=1 << 20):
+        """
+        Stream a document and yield its shingles one chunk at a time.
+        The last k-1 characters (or words) of each chunk are carried into the next one, so every
+        window of the document is emitted without holding the whole text in memory.
+        """
+        if self.word_level:
+            yield from self._iter_word_chunks(filepath, chunk_size)
+        elif self.method == 'rolling':
+            yield from self._iter_mmap_chunks(filepath, chunk_size)
+        else:
+            carry = ''
+            with open(filepath, 'r', encoding='utf-8', errors='ignore') as file:
+                while True:
+                    block = file.read(chunk_size)
+                    if not block:
+                        break
+                    text = carry + self.prepare_text(block)
+                    yield self.create_shingles(text)
+                    carry = text[-(self.k - 1):] if self.k > 1 else ''
+
+    def _iter_mmap_chunks(self, filepath, chunk_size):
+        """Yield rolling-hash shingles from fixed-size windows of a memory-mapped file."""
+        with open(filepath, 'rb') as file:
+            size = os.fstat(file.fileno()).st_size
+            if size == 0:
+                return  # Empty files cannot be memory-mapped
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                for start in range(0, size, chunk_size):
+                    begin = max(start - (self.k - 1), 0)
+                    end = min(start + chunk_size, size)
+                    symbols = np.frombuffer(view, dtype=np.uint8, count=end - begin, offset=begin).astype(np.uint64)
+                    symbols[symbols == ord('\n')] = ord(' ')
+                    yield np.unique(self._rolling_hashes(symbols))
+
+    def _iter_word_chunks(self, filepath, chunk_size):
+        """
+        Yield word shingles from buffered blocks, holding back a word cut by the block edge.
+        MD5 shingles decode the text as process_document does (invalid UTF-8 dropped); rolling
+        shingles split the raw bytes.
+        """
+        carry, partial = [], b''
+        decode = self.method == 'md5'
+        with open(filepath, 'r', encoding='utf-8', errors='ignore') if decode else open(filepath, 'rb') as file:
+            while True:
+                block = file.read(chunk_size)
+                if not block:
+                    break
+                if decode:
+                    block = block.encode('utf-8')
+                words = (partial + block).split()
+                partial = words.pop() if words and not block[-1:].isspace() else b''
+                words = carry + words
+                yield self._shingle_words(words)
+                carry = words[-(self.k - 1):] if self.k > 1 else []
+        if partial:
+            yield self._shingle_words(carry + [partial])
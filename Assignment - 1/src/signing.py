@@ -0,0 +1,44 @@
+from multiprocessing import Pool
+
+def sign_document(filepath, shingler, minhasher, chunk_size=1 << 20):
+    """
+    Stream a document from disk straight into its MinHash signature.
+    Only one chunk of text and its shingles are alive at a time, so memory per document is
+    bounded by chunk_size and the signature instead of by the document's full shingle set.
+    """
+    return minhasher.minhash_chunks(shingler.iter_shingle_chunks(filepath, chunk_size))
+
+
+def stream_signatures(filepaths, shingler, minhasher, chunk_size=1 << 20):
+    """Yield (filepath, signature) for each document, signing them one at a time."""
+    for filepath in filepaths:
+        yield filepath, sign_document(filepath, shingler, minhasher, chunk_size)
+
+
+# Per-process signing state, set once by the pool initializer instead of pickled with every task
+_worker_state = {}
+
+def _init_worker(shingler, minhasher, chunk_size):
+    _worker_state['args'] = (shingler, minhasher, chunk_size)
+
+def _sign_worker(filepath):
+    shingler, minhasher, chunk_size = _worker_state['args']
+    return filepath, sign_document(filepath, shingler, minhasher, chunk_size)
+
+
+def sign_corpus(filepaths, shingler, minhasher, workers=None, chunksize=1, chunk_size=1 << 20):
+    """
+    Sign a corpus across a process pool and yield (filepath, signature) as results arrive.
+    Workers send back only the uint32 signature arrays. Results are yielded in sorted filepath
+    order whatever order workers finish in, so downstream LSH buckets are deterministic.
+    :param workers: Number of worker processes (None = all cores, 1 = sign in this process)
+    :param chunksize: Number of documents handed to a worker per task
+    :param chunk_size: Bytes (or characters) read per streaming chunk within a document
+    """
+    filepaths = sorted(filepaths)
+    if workers == 1 or len(filepaths) <= 1:
+        yield from stream_signatures(filepaths, shingler, minhasher, chunk_size)
+        return
+    with Pool(processes=workers, initializer=_init_worker,
+              initargs=(shingler, minhasher, chunk_size)) as pool:
+        yield from pool.imap(_sign_worker, filepaths, chunksize=chunksize)
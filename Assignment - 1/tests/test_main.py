@@ -0,0 +1,295 @@
+import itertools
+import os
+import tempfile
+import unittest
+import numpy as np
+from shingling import Shingling
+from minhashing import MinHashing, OnePermutationMinHashing
+from signing import sign_document, sign_corpus
+from lsh import LSH
+from lsh_index import LSHIndex
+from compare_sets import CompareSets
+from compare_signatures import CompareSignatures
+from lsh_planner import plan_lsh, error_rates
+
+TEXT = "Locality-sensitive hashing finds similar documents.\nMinHash signatures stand in for shingle sets.\n" * 20
+
+def write_document(directory, name, text):
+    path = os.path.join(directory, name)
+    with open(path, "w") as file:
+        file.write(text)
+    return path
+
+class TestMinHashing(unittest.TestCase):
+    def test_signature_matches_bignum_implementation(self):
+        """
+        Test that the vectorized signature equals the original per-hash Python integer computation.
+        """
+        minhasher = MinHashing(num_hashes=50)
+        shingles = Shingling(k=10).create_shingles(TEXT)
+        max_shingle = 2**32 - 1
+        expected = [min((a * int(shingle, 16) + b) % max_shingle for shingle in shingles)
+                    for a, b in minhasher.hash_functions]
+        self.assertEqual(minhasher.minhash_signature(shingles).tolist(), expected)
+        chunked = MinHashing(num_hashes=50, chunk_size=7).minhash_signature(shingles)
+        self.assertEqual(chunked.tolist(), expected)
+
+class TestRollingShingling(unittest.TestCase):
+    def test_rolling_shingles(self):
+        """
+        Test that rolling shingles are sorted unique ids of every k-window, with newlines read as spaces.
+        """
+        for hash_bits, dtype in ((64, np.uint64), (32, np.uint32)):
+            shingler = Shingling(k=4, method='rolling', hash_bits=hash_bits)
+            shingles = shingler.create_shingles("abcdabcdxy")
+            self.assertEqual(shingles.dtype, dtype)
+            self.assertEqual(len(shingles), 6)  # abcd, bcda, cdab, dabc, bcdx, cdxy (abcd occurs twice)
+            self.assertTrue(np.all(shingles[1:] > shingles[:-1]))
+            np.testing.assert_array_equal(shingler.create_shingles("ab\ncd ef"), shingler.create_shingles("ab cd ef"))
+        words = Shingling(k=2, method='rolling', word_level=True)
+        phrase = words.create_shingles("to be or not to be")
+        np.testing.assert_array_equal(words.create_shingles("to be or\nnot to be"), phrase)
+        self.assertEqual(len(phrase), 4)  # "to be" occurs twice
+
+class TestOnePermutationMinHashing(unittest.TestCase):
+    def test_densified_b_bit_signatures(self):
+        """
+        Test that empty bins are filled from the document's own minima and b-bit values are truncations.
+        """
+        shingles = np.arange(1, 21, dtype=np.uint64) * np.uint64(2654435761)  # Fewer shingles than bins
+        full = OnePermutationMinHashing(num_hashes=64).minhash_signature(shingles)
+        minhasher = OnePermutationMinHashing(num_hashes=64)
+        hashes = (minhasher._a[0] * (shingles % np.uint64(2**32 - 1)) + minhasher._b[0]) % np.uint64(2**32 - 1)
+        self.assertEqual(full.dtype, np.uint32)
+        self.assertTrue(set(full.tolist()) <= set(hashes.tolist()))
+        for b_bits, dtype in ((8, np.uint8), (16, np.uint16)):
+            packed = OnePermutationMinHashing(num_hashes=64, b_bits=b_bits).minhash_signature(shingles)
+            self.assertEqual(packed.dtype, dtype)
+            np.testing.assert_array_equal(packed, full.astype(dtype))
+
+    def test_estimates_match_exact_jaccard(self):
+        """
+        Test that corrected b-bit similarity estimates track exact Jaccard at b = 8, 16 and 32.
+        """
+        rng = np.random.default_rng(3)
+        ids = rng.choice(2**40, size=3000, replace=False).astype(np.uint64)
+        documents = [ids[:1000], ids[500:1500], ids[100:1100], ids[2000:3000]]
+        exact = [[CompareSets.jaccard_similarity(np.sort(first), np.sort(second)) for second in documents]
+                 for first in documents]
+        for b_bits in (8, 16, 32):
+            minhasher = OnePermutationMinHashing(num_hashes=512, b_bits=b_bits)
+            signatures = np.array([minhasher.minhash_signature(document) for document in documents])
+            np.testing.assert_allclose(CompareSignatures.similarity_matrix(signatures), exact, atol=0.07)
+            self.assertAlmostEqual(CompareSignatures.signature_similarity(signatures[0], signatures[0]), 1.0)
+
+    def test_chance_collision_correction(self):
+        """
+        Test that b-bit match rates are corrected for chance agreement and full-width ones are not.
+        """
+        self.assertAlmostEqual(CompareSignatures.correct_b_bit(1 / 256 + (1 - 1 / 256) * 0.5, np.uint8), 0.5)
+        self.assertAlmostEqual(CompareSignatures.correct_b_bit(1 / 65536, np.uint16), 0.0)
+        self.assertEqual(CompareSignatures.correct_b_bit(0.25, np.uint32), 0.25)
+        self.assertEqual(CompareSignatures.correct_b_bit(0.0, np.uint8), 0.0)  # Clipped, never negative
+
+class TestSigning(unittest.TestCase):
+    def test_streaming_matches_whole_document(self):
+        """
+        Test that signing a document in small chunks gives the same signature as signing it whole.
+        """
+        minhasher = MinHashing(num_hashes=30)
+        with tempfile.TemporaryDirectory() as directory:
+            path = write_document(directory, "doc.txt", TEXT)
+            for shingler in (Shingling(k=10), Shingling(k=10, method='rolling'), Shingling(k=3, word_level=True)):
+                whole = minhasher.minhash_signature(shingler.process_document(path))
+                np.testing.assert_array_equal(sign_document(path, shingler, minhasher, chunk_size=37), whole)
+
+    def test_streaming_decodes_like_whole_document(self):
+        """
+        Test that streaming and whole-document shingling drop the same invalid UTF-8 bytes.
+        """
+        minhasher = MinHashing(num_hashes=30)
+        latin1 = ("Café crème brûlée, déjà vu à la française.\n" * 20).encode("latin-1")
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "latin1.txt")
+            with open(path, "wb") as file:
+                file.write(latin1)
+            for shingler in (Shingling(k=3, word_level=True), Shingling(k=10)):
+                whole = minhasher.minhash_signature(shingler.process_document(path))
+                np.testing.assert_array_equal(sign_document(path, shingler, minhasher, chunk_size=37), whole)
+                np.testing.assert_array_equal(minhasher.minhash_signature(shingler.shingle_text(latin1)), whole)
+
+    def test_sign_corpus_order(self):
+        """
+        Test that a parallel corpus signing yields every document in sorted path order.
+        """
+        shingler, minhasher = Shingling(k=10), MinHashing(num_hashes=30)
+        with tempfile.TemporaryDirectory() as directory:
+            paths = [write_document(directory, f"{name}.txt", TEXT[index:]) for index, name in enumerate("cab")]
+            results = list(sign_corpus(paths, shingler, minhasher, workers=2))
+            self.assertEqual([path for path, _ in results], sorted(paths))
+            for path, signature in results:
+                np.testing.assert_array_equal(signature, sign_document(path, shingler, minhasher))
+
+class TestLSH(unittest.TestCase):
+    def build_lsh(self):
+        """30 documents whose first band is identical (one hot bucket) and later bands take 3 values."""
+        rng = np.random.default_rng(7)
+        lsh = LSH(num_bands=3, rows_per_band=2)
+        for doc_id in range(30):
+            bands = [[0, 0]] + [[value, value] for value in rng.integers(0, 3, size=2).tolist()]
+            lsh.lsh_banding(np.array(bands, dtype=np.uint32).ravel(), doc_id)
+        return lsh
+
+    @staticmethod
+    def bucket_pairs(lsh, max_bucket_size=None):
+        """Brute force: every pair of documents sharing a bucket no larger than max_bucket_size."""
+        return {frozenset(pair) for docs in lsh.buckets.values()
+                if max_bucket_size is None or len(docs) <= max_bucket_size
+                for pair in itertools.combinations(docs, 2)}
+
+    def test_candidate_pairs_match_brute_force(self):
+        """
+        Test that every bucket pair is yielded exactly once, and that hot buckets are skipped and recorded.
+        """
+        lsh = self.build_lsh()
+        pairs = [frozenset(pair) for pair in lsh.iter_candidate_pairs()]
+        self.assertEqual(len(pairs), len(set(pairs)))
+        self.assertEqual(set(pairs), self.bucket_pairs(lsh))
+        self.assertEqual(lsh.hot_buckets, {})
+        self.assertEqual({frozenset(pair) for pair in lsh.get_candidate_pairs()}, set(pairs))
+
+        pairs = [frozenset(pair) for pair in lsh.iter_candidate_pairs(max_bucket_size=12)]
+        self.assertEqual(len(pairs), len(set(pairs)))
+        self.assertEqual(set(pairs), self.bucket_pairs(lsh, 12))
+        hot = {key: len(docs) for key, docs in lsh.buckets.items() if len(docs) > 12}
+        self.assertIn(lsh.band_keys([0] * 6)[0], hot)
+        self.assertEqual(lsh.hot_buckets, hot)
+
+    def test_sampled_hot_buckets(self):
+        """
+        Test that sampling a hot bucket yields each pair once, only among max_bucket_size of its documents.
+        """
+        lsh = self.build_lsh()
+        pairs = [frozenset(pair) for pair in lsh.iter_candidate_pairs(max_bucket_size=14, sample=True, seed=1)]
+        self.assertEqual(len(pairs), len(set(pairs)))
+        pairs = set(pairs)
+        cold_pairs = self.bucket_pairs(lsh, 14)
+        self.assertTrue(cold_pairs < pairs <= self.bucket_pairs(lsh))
+        # Only the first band's bucket (all 30 documents) is hot; its extra pairs come from a 14-document sample
+        self.assertEqual(list(lsh.hot_buckets.values()), [30])
+        self.assertLessEqual(len({doc_id for pair in pairs - cold_pairs for doc_id in pair}), 14)
+        # The same seed samples the same documents
+        self.assertEqual(lsh.get_candidate_pairs(max_bucket_size=14, sample=True, seed=1),
+                         set(lsh.iter_candidate_pairs(max_bucket_size=14, sample=True, seed=1)))
+
+class TestLSHIndex(unittest.TestCase):
+    def test_save_load_remove_compact(self):
+        """
+        Test that an index survives reopening, removal and compaction with its signatures and buckets.
+        """
+        rng = np.random.default_rng(0)
+        signatures = {f"doc{i}": rng.integers(0, 2**32, size=20, dtype=np.uint32) for i in range(5)}
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "index")
+            index = LSHIndex(path, num_bands=4, rows_per_band=5)
+            for doc_id, signature in signatures.items():
+                index.add_document(doc_id, signature)
+            index.save()
+
+            index = LSHIndex(path)
+            self.assertEqual((index.num_bands, index.rows_per_band, len(index)), (4, 5, 5))
+            np.testing.assert_array_equal(index.get_signature("doc3"), signatures["doc3"])
+            self.assertEqual(index.query(signatures["doc2"], threshold=1.0), [("doc2", 1.0)])
+
+            index.remove_document("doc1")
+            index.save()
+            index = LSHIndex(path)
+            self.assertNotIn("doc1", index)
+            self.assertEqual(index.query(signatures["doc1"]), [])
+
+            index.compact()
+            self.assertEqual(os.path.getsize(os.path.join(path, "signatures.bin")), 4 * 20 * 4)
+            self.assertFalse([name for name in os.listdir(path) if name.endswith(".tmp")])
+            index = LSHIndex(path)
+            self.assertEqual(index.doc_ids, ["doc0", "doc2", "doc3", "doc4"])
+            for doc_id in index.doc_ids:
+                np.testing.assert_array_equal(index.get_signature(doc_id), signatures[doc_id])
+                self.assertEqual(index.query(signatures[doc_id], threshold=1.0), [(doc_id, 1.0)])
+
+    def test_packed_signatures_round_trip(self):
+        """
+        Test that an index stores uint8/uint16 signatures at their width and reloads them unchanged.
+        """
+        rng = np.random.default_rng(1)
+        for dtype in (np.uint8, np.uint16):
+            documents = {f"doc{i}": rng.integers(0, 2**40, size=200).astype(np.uint64) for i in range(3)}
+            minhasher = OnePermutationMinHashing(num_hashes=20, b_bits=8 * np.dtype(dtype).itemsize)
+            signatures = {doc_id: minhasher.minhash_signature(ids) for doc_id, ids in documents.items()}
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "index")
+                index = LSHIndex(path, num_bands=4, rows_per_band=5, dtype=dtype)
+                for doc_id, signature in signatures.items():
+                    index.add_document(doc_id, signature)
+                with self.assertRaises(ValueError):
+                    index.add_document("wide", signatures["doc0"].astype(np.uint32))
+                index.save()
+                signature_bytes = os.path.getsize(os.path.join(path, "signatures.bin"))
+                self.assertEqual(signature_bytes, 3 * 20 * np.dtype(dtype).itemsize)
+
+                index = LSHIndex(path)
+                self.assertEqual(index.dtype, dtype)
+                for doc_id, signature in signatures.items():
+                    self.assertEqual(index.get_signature(doc_id).dtype, dtype)
+                    np.testing.assert_array_equal(index.get_signature(doc_id), signature)
+                    self.assertEqual(index.query(signature, k=1), [(doc_id, 1.0)])
+
+    def test_text_query_finds_multiline_document(self):
+        """
+        Test that querying with a document's own multi-line text finds it with similarity 1.0.
+        """
+        shingler, minhasher = Shingling(k=5), MinHashing(num_hashes=20)
+        text = "The quick brown fox\njumps over\nthe lazy dog.\n" * 3
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "doc.txt")
+            with open(path, "w") as file:
+                file.write(text)
+            index = LSHIndex(os.path.join(directory, "index"), num_bands=4, rows_per_band=5)
+            index.add_document("doc", minhasher.minhash_signature(shingler.process_document(path)))
+            self.assertEqual(index.query(text, shingler=shingler, minhasher=minhasher), [("doc", 1.0)])
+            verified = index.query(text, shingler=shingler, minhasher=minhasher,
+                                   load_shingles=lambda doc_id: shingler.process_document(path))
+            self.assertEqual(verified, [("doc", 1.0)])
+
+class TestCompareSets(unittest.TestCase):
+    def test_jaccard_matrix_matches_set_similarity(self):
+        """
+        Test that the per-document uint64 ids give the same Jaccard values as the MD5 string sets.
+        """
+        shingler = Shingling(k=4)
+        documents = ["abcdefghij", "abcdefgxyz", "qrstuvwxyz", ""]
+        shingle_sets = [shingler.create_shingles(document) for document in documents]
+        matrix = CompareSets.jaccard_matrix(shingle_sets)
+        for i, first in enumerate(shingle_sets):
+            for j, second in enumerate(shingle_sets):
+                self.assertAlmostEqual(matrix[i, j], CompareSets.jaccard_similarity(first, second))
+
+class TestLSHPlanner(unittest.TestCase):
+    def test_plan_meets_normalized_budgets(self):
+        """
+        Test that error rates are per-interval averages and plans keep a usable signature length.
+        """
+        # One band of one row: the candidate probability is s, so the mean miss rates are t/2 and (1-t)/2
+        false_positive, false_negative = error_rates(0.6, 1, 1)
+        self.assertAlmostEqual(false_positive, 0.3)
+        self.assertAlmostEqual(false_negative, 0.2)
+        for threshold in (0.3, 0.5, 0.7, 0.8, 0.9):
+            plan = plan_lsh(threshold)
+            self.assertTrue(plan.within_budget)
+            self.assertGreaterEqual(plan.num_hashes, 100)
+            self.assertLessEqual(plan.false_positive, 0.1)
+            self.assertLessEqual(plan.false_negative, 0.1)
+        # An unreachable budget falls back to the lowest-error layout and says so
+        self.assertFalse(plan_lsh(0.8, max_false_positive=0.01, max_false_negative=0.01).within_budget)
+
+if __name__ == '__main__':
+    unittest.main()
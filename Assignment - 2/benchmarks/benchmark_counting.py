@@ -0,0 +1,59 @@
+"""
+Compare the apriori support counters on T10I4D100K.
+
+Counts the level-2 candidates of the given support with each counting function in a single
+process, so the numbers reflect the counting algorithm rather than pool start-up or pickling.
+
+    python benchmarks/benchmark_counting.py --support 0.01 --transactions 5000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from apriori import count_candidates_chunk, count_candidates_trie, count_candidates_vertical, generate_candidates
+from utils import load_dataset, get_item_counts, build_tid_bitmaps
+
+def count_vertical(candidates, transactions, items):
+    item_bitmaps = build_tid_bitmaps(transactions, items)
+    parent_bitmaps = {frozenset([item]): bitmap for item, bitmap in item_bitmaps.items()}
+    counts, _ = count_candidates_vertical(candidates, item_bitmaps, parent_bitmaps)
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dataset", default=os.path.join(os.path.dirname(__file__), "..", "data", "T10I4D100K.dat"))
+    parser.add_argument("--support", type=float, default=0.01)
+    parser.add_argument("--transactions", type=int, default=5000,
+                        help="Use only the first N transactions (0 = all); the horizontal counter is slow")
+    parser.add_argument("--engines", nargs="+", default=["horizontal", "trie", "vertical"],
+                        choices=["horizontal", "trie", "vertical"])
+    args = parser.parse_args()
+
+    transactions = load_dataset(args.dataset)
+    if args.transactions:
+        transactions = transactions[:args.transactions]
+    item_counts = get_item_counts(transactions)
+    items = [item for item, count in item_counts.items() if count / len(transactions) >= args.support]
+    candidates = generate_candidates([{item} for item in items], 2)
+    print(f"{len(transactions)} transactions, {len(items)} frequent items, {len(candidates)} level-2 candidates")
+
+    counters = {
+        "horizontal": lambda: count_candidates_chunk(candidates, transactions),
+        "trie": lambda: count_candidates_trie(candidates, transactions),
+        "vertical": lambda: count_vertical(candidates, transactions, items),
+    }
+    reference = None
+    for engine in args.engines:
+        start = time.perf_counter()
+        counts = counters[engine]()
+        elapsed = time.perf_counter() - start
+        if reference is None:
+            reference = counts
+        status = "ok" if counts == reference else "MISMATCH"
+        print(f"{engine:>10}: {elapsed:8.3f} s  ({status})")
+
+if __name__ == "__main__":
+    main()
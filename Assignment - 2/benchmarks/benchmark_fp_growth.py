@@ -0,0 +1,40 @@
+"""
+Compare FP-Growth with apriori() on T10I4D100K across the support thresholds in output/.
+
+    python benchmarks/benchmark_fp_growth.py --supports 0.01 0.02 0.035 0.05 --engines trie vertical
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from apriori import apriori
+from fp_growth import fp_growth
+from utils import load_dataset
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dataset", default=os.path.join(os.path.dirname(__file__), "..", "data", "T10I4D100K.dat"))
+    parser.add_argument("--supports", type=float, nargs="+", default=[0.01, 0.02, 0.035, 0.05])
+    parser.add_argument("--engines", nargs="+", default=["trie", "vertical"],
+                        choices=["horizontal", "trie", "vertical"], help="apriori() counting engines to compare")
+    args = parser.parse_args()
+
+    transactions = load_dataset(args.dataset)
+    print(f"{len(transactions)} transactions")
+    for min_support in args.supports:
+        start = time.perf_counter()
+        reference = set(map(frozenset, fp_growth(transactions, min_support)))
+        print(f"support {min_support}: {len(reference)} frequent itemsets")
+        print(f"{'fp_growth':>18}: {time.perf_counter() - start:8.3f} s")
+        for engine in args.engines:
+            start = time.perf_counter()
+            itemsets = set(map(frozenset, apriori(transactions, min_support, engine=engine)))
+            elapsed = time.perf_counter() - start
+            status = "ok" if itemsets == reference else "MISMATCH"
+            print(f"{'apriori/' + engine:>18}: {elapsed:8.3f} s  ({status})")
+
+if __name__ == "__main__":
+    main()
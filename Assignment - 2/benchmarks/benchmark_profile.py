@@ -0,0 +1,252 @@
+"""
+Profile apriori(), count_candidates_parallel and generate_rules on T10I4D100K and on synthetic
+IBM Quest-style datasets, and write the measurements as JSON and CSV for tracking over time.
+
+Datasets are file paths or Quest specs such as quest:T10I4D20K (average transaction size T,
+average pattern size I, D transactions; append N<items> / L<patterns> to override the defaults
+of 1000 items and 2000 patterns). Every case runs in a fresh process, so peak RSS is per case.
+Recorded per apriori() level: joined, pruned, counted and frequent candidates, generation and
+counting time, and the bytes/time spent pickling the tasks shipped to the worker pool.
+
+    python benchmarks/benchmark_profile.py --datasets data/T10I4D100K.dat quest:T10I4D20K \\
+        --supports 0.01 0.02 --engines trie vertical --json results.json --csv results.csv
+    python benchmarks/benchmark_profile.py --write-dataset quest:T10I4D100 data/sample_data.dat
+"""
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import pickle
+import platform
+import re
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from apriori import apriori, count_candidates_chunk, count_candidates_parallel, divide_into_chunks, generate_candidates
+from rule_generator import generate_rules
+from utils import load_transactions, get_item_counts
+
+CSV_FIELDS = ["dataset", "function", "engine", "min_support", "level", "candidates", "generated", "pruned",
+              "frequent", "generate_time", "count_time", "pickle_time", "ipc_bytes", "total_time", "result_size",
+              "load_rss_mb", "peak_rss_mb", "children_peak_rss_mb"]
+
+def generate_quest_transactions(num_transactions, avg_transaction_size=10, avg_pattern_size=4, num_items=1000,
+                                num_patterns=2000, correlation=0.5, seed=42):
+    """
+    Synthetic market-basket transactions following the IBM Quest generator (Agrawal & Srikant, 1994).
+    Potentially large itemsets (patterns) of Poisson-distributed size share an exponentially
+    distributed fraction of their items with the previous pattern, and have exponential weights and
+    a per-pattern corruption level. Each transaction, of Poisson-distributed size, is filled with
+    weighted random patterns from which items are dropped while a uniform draw stays below the
+    pattern's corruption level; a pattern that does not fit is kept for the next transaction half of
+    the time and added anyway otherwise.
+    """
+    rng = np.random.default_rng(seed)
+    patterns = []
+    previous = np.zeros(0, dtype=np.int64)
+    for _ in range(num_patterns):
+        size = max(1, rng.poisson(avg_pattern_size))
+        shared = min(int(round(rng.exponential(correlation) * size)), size, len(previous))
+        items = set(rng.choice(previous, shared, replace=False).tolist()) if shared else set()
+        while len(items) < size:
+            items.add(int(rng.integers(num_items)))
+        previous = np.array(sorted(items))
+        patterns.append(previous)
+    cumulative_weights = np.cumsum(rng.exponential(1.0, num_patterns))
+    cumulative_weights /= cumulative_weights[-1]
+    corruption = np.clip(rng.normal(0.5, 0.1, num_patterns), 0.0, 1.0)
+
+    transactions = []
+    carried = None
+    for _ in range(num_transactions):
+        size = max(1, rng.poisson(avg_transaction_size))
+        transaction = set()
+        while len(transaction) < size:
+            if carried is not None:
+                index = carried
+            else:
+                index = min(int(np.searchsorted(cumulative_weights, rng.random())), num_patterns - 1)
+            carried = None
+            items = patterns[index]
+            keep = len(items)
+            while keep > 0 and rng.random() < corruption[index]:
+                keep -= 1
+            items = rng.permutation(items)[:keep].tolist()
+            if transaction and len(transaction) + len(items) > size and rng.random() < 0.5:
+                carried = index
+                break
+            transaction.update(items)
+        transactions.append(transaction)
+    return transactions
+
+def parse_quest_spec(spec):
+    """Parse quest:T10I4D100K[N1000][L2000] into generate_quest_transactions() arguments."""
+    match = re.fullmatch(r"quest:T(\d+)I(\d+)D(\d+)(K?)(?:N(\d+))?(?:L(\d+))?", spec)
+    if match is None:
+        raise ValueError(f"Invalid Quest dataset spec: {spec}")
+    size, pattern, count, thousands, items, num_patterns = match.groups()
+    return {"num_transactions": int(count) * (1000 if thousands else 1),
+            "avg_transaction_size": int(size), "avg_pattern_size": int(pattern),
+            "num_items": int(items or 1000), "num_patterns": int(num_patterns or 2000)}
+
+def load_benchmark_dataset(spec):
+    """Load a dataset file (as memory-mapped CSR transactions) or generate a Quest dataset."""
+    if spec.startswith("quest:"):
+        return generate_quest_transactions(**parse_quest_spec(spec))
+    return load_transactions(spec)
+
+def write_transactions(transactions, filepath):
+    """Write transactions in the .dat format: one line of space-separated items per transaction."""
+    with open(filepath, "w") as file:
+        for transaction in transactions:
+            file.write(" ".join(map(str, sorted(transaction))) + " \n")
+
+def peak_rss_mb(who=resource.RUSAGE_SELF):
+    """Peak resident set size in MiB (ru_maxrss is KiB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(who).ru_maxrss
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+def profile_apriori(transactions, case):
+    levels = []
+    start = time.perf_counter()
+    supports = apriori(transactions, case["min_support"], engine=case["engine"], stats=levels,
+                       workers=case["workers"], return_counts=True)
+    return {"total_time": time.perf_counter() - start, "result_size": len(supports), "levels": levels}
+
+def profile_count_candidates_parallel(transactions, case):
+    """Count the level-2 candidates with the original candidate-partitioned pool."""
+    if case["transactions"]:
+        transactions = transactions[:case["transactions"]]
+    transactions = [set(transaction) for transaction in transactions]
+    item_counts = get_item_counts(transactions)
+    items = [item for item, count in item_counts.items() if count / len(transactions) >= case["min_support"]]
+    candidates = generate_candidates([{item} for item in items], 2)
+    # Payloads as count_candidates_parallel ships them: every chunk of candidates with all transactions
+    start = time.perf_counter()
+    payloads = [pickle.dumps((chunk, transactions))
+                for chunk in divide_into_chunks(candidates, os.cpu_count() or 1)] if candidates else []
+    pickle_time = time.perf_counter() - start
+    start = time.perf_counter()
+    counts = count_candidates_parallel(candidates, transactions, count_candidates_chunk)
+    return {"total_time": time.perf_counter() - start, "result_size": len(counts), "candidates": len(candidates),
+            "pickle_time": pickle_time, "ipc_bytes": sum(map(len, payloads)), "transactions": len(transactions)}
+
+def profile_generate_rules(transactions, case):
+    """Generate rules from the supports apriori() returns (mining time is not included)."""
+    supports = apriori(transactions, case["min_support"], engine="vertical", return_counts=True)
+    start = time.perf_counter()
+    rules = generate_rules(supports, transactions, case["min_confidence"])
+    return {"total_time": time.perf_counter() - start, "result_size": len(rules), "frequent": len(supports)}
+
+PROFILERS = {
+    "apriori": profile_apriori,
+    "count_candidates_parallel": profile_count_candidates_parallel,
+    "generate_rules": profile_generate_rules,
+}
+
+def _run_case(case, connection):
+    """Child process entry point: load the dataset, run one profiler and send back the record."""
+    transactions = load_benchmark_dataset(case["dataset"])
+    load_rss = peak_rss_mb()
+    record = dict(case)
+    record.update(PROFILERS[case["function"]](transactions, case))
+    record.update(load_rss_mb=load_rss, peak_rss_mb=peak_rss_mb(),
+                  children_peak_rss_mb=peak_rss_mb(resource.RUSAGE_CHILDREN))
+    connection.send(record)
+    connection.close()
+
+def run_isolated(case):
+    """Run a case in a fresh (spawned) process so its peak RSS is not inflated by earlier cases."""
+    context = multiprocessing.get_context("spawn")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_run_case, args=(case, sender))
+    process.start()
+    sender.close()
+    record = receiver.recv()
+    process.join()
+    return record
+
+def build_cases(args):
+    cases = []
+    for dataset in args.datasets:
+        for min_support in args.supports:
+            common = {"dataset": dataset, "min_support": min_support, "workers": args.workers}
+            for function in args.functions:
+                if function == "apriori":
+                    cases.extend(dict(common, function=function, engine=engine) for engine in args.engines)
+                elif function == "count_candidates_parallel":
+                    cases.append(dict(common, function=function, engine="horizontal",
+                                      transactions=args.parallel_transactions))
+                else:
+                    cases.append(dict(common, function=function, engine="vertical",
+                                      min_confidence=args.confidence))
+    return cases
+
+def csv_rows(records):
+    """Flatten records into one row per case plus one row per apriori() level."""
+    for record in records:
+        yield {field: record.get(field, "") for field in CSV_FIELDS}
+        for level in record.get("levels", []):
+            row = {field: record.get(field, "") for field in ("dataset", "function", "engine", "min_support")}
+            row.update({field: value for field, value in level.items() if field != "k"}, level=level["k"])
+            yield row
+
+def environment():
+    """Metadata identifying the run, so results from different commits and machines can be compared."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ""
+    return {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "commit": commit, "python": platform.python_version(),
+            "numpy": np.__version__, "platform": platform.platform(), "cpu_count": os.cpu_count()}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--datasets", nargs="+",
+                        default=[os.path.join(os.path.dirname(__file__), "..", "data", "T10I4D100K.dat"),
+                                 "quest:T10I4D20K"])
+    parser.add_argument("--supports", type=float, nargs="+", default=[0.01, 0.02])
+    parser.add_argument("--functions", nargs="+", default=list(PROFILERS), choices=list(PROFILERS))
+    parser.add_argument("--engines", nargs="+", default=["trie", "vertical"], choices=["horizontal", "trie", "vertical"])
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--confidence", type=float, default=0.6)
+    parser.add_argument("--parallel-transactions", type=int, default=2000,
+                        help="Transactions given to count_candidates_parallel (0 = all); it is slow")
+    parser.add_argument("--json", default="benchmark_results.json")
+    parser.add_argument("--csv", default="benchmark_results.csv")
+    parser.add_argument("--write-dataset", nargs=2, metavar=("SPEC", "PATH"),
+                        help="Write a Quest dataset in the .dat format and exit")
+    args = parser.parse_args()
+
+    if args.write_dataset:
+        spec, path = args.write_dataset
+        write_transactions(load_benchmark_dataset(spec), path)
+        print(f"Wrote {spec} to {path}")
+        return
+
+    records = []
+    for case in build_cases(args):
+        record = run_isolated(case)
+        records.append(record)
+        print(f"{os.path.basename(record['dataset']):>20} {record['function']:>25} {record['engine']:>10} "
+              f"s={record['min_support']:<6} {record['total_time']:8.3f} s  result={record['result_size']:<6} "
+              f"peak={record['peak_rss_mb']:.0f} MiB")
+
+    with open(args.json, "w") as file:
+        json.dump({"environment": environment(), "results": records}, file, indent=2)
+    with open(args.csv, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        writer.writerows(csv_rows(records))
+    print(f"Results written to {args.json} and {args.csv}")
+
+if __name__ == "__main__":
+    main()
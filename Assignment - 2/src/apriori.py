@@ -1,50 +1,138 @@
 import itertools
+import math
+import os
+import time
 from multiprocessing import Pool
-from utils import load_dataset, get_item_counts
+from utils import load_transactions, get_item_counts, build_tid_bitmaps
 from rule_generator import generate_rules
+from parallel_counter import ParallelCounter
 
-def apriori(transactions, min_support):
+def apriori(transactions, min_support, engine="horizontal", stats=None, workers=None, return_counts=False):
     """
     A-Priori algorithm for frequent itemset mining with multiprocessing support.
+    engine selects how candidate support is counted: "horizontal" scans the transactions for every
+    candidate in parallel, "trie" walks each transaction through a prefix trie of the candidates
+    in parallel, "vertical" intersects per-item TID bitmaps.
+    If a stats list is given, one dict per level is appended with the number of joined, pruned,
+    counted and frequent candidates and the time spent generating and counting them (plus, when
+    counted by the pool, the bytes and time spent pickling the tasks shipped to it).
+    The parallel engines start one pool of `workers` processes (default: all cores) for the whole
+    run, sharing the transactions with it once; small inputs are counted in-process.
+    With return_counts, a {frozenset itemset: support count} map of the frequent itemsets is
+    returned instead of the list, so rules can be generated without rescanning the data.
     """
+    if engine not in ("horizontal", "trie", "vertical"):
+        raise ValueError(f"Unknown counting engine: {engine}")
     # Step 1: Count single items
     item_counts = get_item_counts(transactions)
     total_transactions = len(transactions)
     frequent_itemsets = [{item} for item, count in item_counts.items() if count / total_transactions >= min_support]
+    item_bitmaps = None
+    if engine == "vertical":
+        item_bitmaps = build_tid_bitmaps(transactions, [item for (item,) in frequent_itemsets])
 
+    supports = {frozenset(itemset): item_counts[item] for itemset in frequent_itemsets for item in itemset}
+    counter = None if engine == "vertical" else ParallelCounter(transactions, workers)
+    try:
+        results = _mine_levels(frequent_itemsets, transactions, min_support, engine, counter, item_bitmaps,
+                               stats, supports)
+    finally:
+        if counter is not None:
+            counter.close()
+    return supports if return_counts else results
+
+def _mine_levels(frequent_itemsets, transactions, min_support, engine, counter, item_bitmaps, stats, supports):
+    """Run the level-wise candidate generation and counting loop of apriori(), recording supports."""
+    total_transactions = len(transactions)
+    if engine == "vertical":
+        parent_bitmaps = {frozenset([item]): bitmap for item, bitmap in item_bitmaps.items()}
     results = []  # Store all frequent itemsets
     k = 1
     while frequent_itemsets:
         results.extend(frequent_itemsets)
         # Generate candidates of size k+1
-        candidates = generate_candidates(frequent_itemsets, k + 1)
-        # Count support for candidates using multiprocessing
-        candidate_counts = count_candidates_parallel(candidates, transactions)
+        level_stats = {"k": k + 1}
+        start = time.perf_counter()
+        candidates = generate_candidates(frequent_itemsets, k + 1, level_stats)
+        level_stats["generate_time"] = time.perf_counter() - start
+        start = time.perf_counter()
+        # Only ask the counter for IPC stats when profiling: measuring them pickles every task again
+        ipc_stats = level_stats if stats is not None else None
+        if engine == "vertical":
+            # Only frequent candidates keep their bitmaps (as the next level's parents)
+            candidate_counts, parent_bitmaps = count_candidates_vertical(
+                candidates, item_bitmaps, parent_bitmaps, _min_support_count(min_support, total_transactions))
+        elif engine == "trie":
+            candidate_counts = counter.count(candidates, count_candidates_trie, ipc_stats)
+        else:
+            # Count support for candidates using multiprocessing
+            candidate_counts = counter.count(candidates, count_candidates_chunk, ipc_stats)
         # Filter frequent itemsets
         frequent_itemsets = [
             itemset for itemset, count in candidate_counts.items()
             if count / total_transactions >= min_support
         ]
+        supports.update((itemset, candidate_counts[itemset]) for itemset in frequent_itemsets)
+        level_stats["count_time"] = time.perf_counter() - start
+        level_stats["candidates"] = len(candidates)
+        level_stats["frequent"] = len(frequent_itemsets)
+        if stats is not None:
+            stats.append(level_stats)
         k += 1
 
     return results
 
-def generate_candidates(itemsets, k):
+def _min_support_count(min_support, total_transactions):
+    """Smallest support count c with c / total_transactions >= min_support (the test apriori applies)."""
+    count = max(math.ceil(min_support * total_transactions), 0)
+    # Step past float rounding in min_support * total_transactions
+    while count > 0 and (count - 1) / total_transactions >= min_support:
+        count -= 1
+    while count / total_transactions < min_support:
+        count += 1
+    return count
+
+def generate_candidates(itemsets, k, stats=None):
     """
-    Generate candidate k-itemsets from (k-1)-itemsets.
+    Generate candidate k-itemsets from frequent (k-1)-itemsets.
+    Itemsets are joined as sorted tuples only when they share their first k-2 items (prefix join),
+    and a join is pruned unless every one of its (k-1)-subsets is frequent. Each candidate is
+    produced once, in sorted order. If a stats dict is given, the number of joined and pruned
+    candidates is recorded in it.
     """
-    return [
-        frozenset(a.union(b)) for a in itemsets for b in itemsets
-        if len(a.union(b)) == k
-    ]
+    frequent = sorted(tuple(sorted(itemset)) for itemset in itemsets)
+    frequent_set = set(frequent)
+    candidates = []
+    generated = pruned = 0
+    # Sorted order keeps itemsets with a common prefix contiguous
+    for _, group in itertools.groupby(frequent, key=lambda itemset: itemset[:-1]):
+        group = list(group)
+        for i in range(len(group)):
+            for j in range(i + 1, len(group)):
+                candidate = group[i] + group[j][-1:]
+                generated += 1
+                # The two joined subsets are frequent; check the other k-2 subsets
+                if all(candidate[:m] + candidate[m + 1:] in frequent_set for m in range(k - 2)):
+                    candidates.append(frozenset(candidate))
+                else:
+                    pruned += 1
+    if stats is not None:
+        stats["generated"] = generated
+        stats["pruned"] = pruned
+    return candidates
 
-def count_candidates_parallel(candidates, transactions):
+def count_candidates_parallel(candidates, transactions, counter=None):
     """
     Count the support of each candidate itemset in the transactions using multiprocessing.
+    counter is the per-chunk counting function (count_candidates_chunk by default).
     """
-    pool = Pool()  # Use all available CPU cores
-    chunks = divide_into_chunks(candidates, len(pool._pool))
-    results = pool.starmap(count_candidates_chunk, [(chunk, transactions) for chunk in chunks])
+    counter = counter or count_candidates_chunk
+    if not candidates:
+        return {}
+    processes = os.cpu_count() or 1
+    pool = Pool(processes)  # Use all available CPU cores
+    chunks = divide_into_chunks(candidates, processes)
+    results = pool.starmap(counter, [(chunk, transactions) for chunk in chunks])
     pool.close()
     pool.join()
 
@@ -67,6 +155,80 @@ def count_candidates_chunk(candidates_chunk, transactions):
                 counts[candidate] += 1
     return counts
 
+def build_candidate_trie(candidates):
+    """
+    Build a prefix trie of candidates: nested dicts keyed by the candidates' sorted items, with
+    the candidate itself stored at depth k.
+    """
+    trie = {}
+    for candidate in candidates:
+        node = trie
+        items = sorted(candidate)
+        for item in items[:-1]:
+            node = node.setdefault(item, {})
+        node[items[-1]] = candidate
+    return trie
+
+def count_candidates_trie(candidates_chunk, transactions):
+    """
+    Count support for a chunk of candidates by walking every transaction's sorted items through a
+    prefix trie of the candidates. Only trie paths present in the transaction are followed, so the
+    cost per transaction depends on the candidates it contains rather than on the number of candidates.
+    """
+    counts = {candidate: 0 for candidate in candidates_chunk}
+    if not counts:
+        return counts
+    k = len(next(iter(counts)))
+    trie = build_candidate_trie(counts)
+    trie_items = set().union(*counts)
+
+    def walk(node, items, start, depth):
+        # Leave room for the k - depth items still needed below this node
+        for i in range(start, len(items) - (k - depth) + 1):
+            child = node.get(items[i])
+            if child is None:
+                continue
+            if depth + 1 == k:
+                counts[child] += 1
+            else:
+                walk(child, items, i + 1, depth + 1)
+
+    for transaction in transactions:
+        items = sorted(item for item in transaction if item in trie_items)
+        if len(items) >= k:
+            walk(trie, items, 0, 0)
+    return counts
+
+def count_candidates_vertical(candidates, item_bitmaps, parent_bitmaps, min_count=0):
+    """
+    Count support for candidates from TID bitmaps.
+    Each candidate's bitmap is its cached frequent (k-1)-subset's bitmap ANDed with the bitmap of
+    the remaining item, so a level costs one AND and one popcount per distinct candidate.
+    Returns the counts and the bitmaps of the candidates with at least min_count transactions (to
+    cache as the next level's parents); every other bitmap is dropped as soon as it is counted, so
+    memory grows with the frequent itemsets rather than with the candidates.
+    """
+    counts = {}
+    bitmaps = {}
+    for candidate in candidates:
+        if candidate in counts:
+            continue
+        bitmap = None
+        for item in candidate:
+            parent = candidate - {item}
+            if parent in parent_bitmaps:
+                bitmap = parent_bitmaps[parent] & item_bitmaps[item]
+                break
+        if bitmap is None:
+            # No cached parent: intersect the item bitmaps directly
+            bitmap = -1
+            for item in candidate:
+                bitmap &= item_bitmaps[item]
+        counts[candidate] = bitmap.bit_count()
+        if counts[candidate] >= min_count:
+            bitmaps[candidate] = bitmap
+    return counts, bitmaps
+
 def divide_into_chunks(data, n):
     """
     Divide data into n roughly equal chunks.
@@ -76,16 +238,17 @@ def divide_into_chunks(data, n):
 
 if __name__ == "__main__":
     filepath = "./data/T10I4D100K.dat"
-    transactions = load_dataset(filepath)
+    transactions = load_transactions(filepath)
     min_support = 0.01   
-    frequent_itemsets = apriori(transactions, min_support)
+    supports = apriori(transactions, min_support, return_counts=True)
+    # Single items are written as plain sets, as apriori() lists them and sweep.write_results writes them
+    frequent_itemsets = [set(itemset) if len(itemset) == 1 else itemset for itemset in supports]
 
-    # Validate and print support counts
+    # Print support counts recorded by the miner
     total_transactions = len(transactions)
     print("\nFrequent Itemsets with Support:")
-    for itemset in frequent_itemsets:
-        support = sum(1 for transaction in transactions if itemset.issubset(transaction)) / total_transactions
-        print(f"Itemset: {itemset}, Support: {support:.2f}")
+    for itemset, count in zip(frequent_itemsets, supports.values()):
+        print(f"Itemset: {itemset}, Support: {count / total_transactions:.2f}")
 
     # Save sorted frequent itemsets to a file
     output_file = "./output/frequent_itemsets0_01.txt"
@@ -97,7 +260,7 @@ if __name__ == "__main__":
 
     # Generate and save association rules
     min_confidence = 0.6
-    rules = generate_rules(frequent_itemsets, transactions, min_confidence)
+    rules = generate_rules(supports, transactions, min_confidence)
     rules_file = "./output/association_rules0_01.txt"
     with open(rules_file, "w") as file:
         for antecedent, consequent, confidence in rules:
@@ -0,0 +1,103 @@
+from utils import get_item_counts
+
+class FPNode:
+    """A node of an FP-tree: one item on a shared transaction prefix, with the count of that prefix."""
+    __slots__ = ("item", "count", "parent", "children")
+
+    def __init__(self, item, parent):
+        self.item = item
+        self.count = 0
+        self.parent = parent
+        self.children = {}
+
+class FPTree:
+    """
+    Prefix tree of transactions restricted to frequent items in a fixed (descending frequency) order.
+    header maps each item to the list of its nodes, replacing the classic node-link chain.
+    """
+    def __init__(self, rank):
+        self.root = FPNode(None, None)
+        self.rank = rank  # Item -> position in the insertion order
+        self.header = {item: [] for item in rank}
+
+    def insert(self, items, count):
+        """Insert a transaction (items already filtered and sorted by rank) with a multiplicity."""
+        node = self.root
+        for item in items:
+            child = node.children.get(item)
+            if child is None:
+                child = node.children[item] = FPNode(item, node)
+                self.header[item].append(child)
+            child.count += count
+            node = child
+
+    def prefix_paths(self, item):
+        """Yield (path items from the root side, count) for every node of an item."""
+        for node in self.header[item]:
+            path = []
+            parent = node.parent
+            while parent.item is not None:
+                path.append(parent.item)
+                parent = parent.parent
+            path.reverse()
+            yield path, node.count
+
+def fp_growth(transactions, min_support, return_counts=False):
+    """
+    FP-Growth frequent itemset mining.
+    Two passes over the transactions build the FP-tree; itemsets are then mined by recursively
+    building conditional FP-trees straight from each item's prefix paths, without candidate
+    generation or copies of the conditional databases. The result matches apriori(): a list of
+    single-item sets followed by frozensets of the larger itemsets, or with return_counts a
+    {frozenset itemset: support count} map.
+    """
+    total_transactions = len(transactions)
+
+    def is_frequent(count):
+        # Same test as apriori() so borderline itemsets are classified identically
+        return count / total_transactions >= min_support
+
+    # Pass 1: frequent items, ordered by descending count
+    item_counts = get_item_counts(transactions)
+    frequent_items = sorted((item for item, count in item_counts.items() if is_frequent(count)),
+                            key=lambda item: (-item_counts[item], item))
+    tree = FPTree({item: position for position, item in enumerate(frequent_items)})
+    # Pass 2: insert each transaction's frequent items in that order
+    for transaction in transactions:
+        items = sorted((item for item in transaction if item in tree.rank), key=tree.rank.__getitem__)
+        if items:
+            tree.insert(items, 1)
+
+    supports = {}
+    _mine(tree, (), is_frequent, supports)
+    if return_counts:
+        return {frozenset(itemset): count for itemset, count in sorted(supports.items(), key=lambda entry: len(entry[0]))}
+    itemsets = sorted(supports, key=len)
+    return [set(itemset) if len(itemset) == 1 else frozenset(itemset) for itemset in itemsets]
+
+def _mine(tree, suffix, is_frequent, supports):
+    """Record every frequent itemset ending in `suffix` found in a (conditional) FP-tree."""
+    # Least frequent items first, as in the classic bottom-up traversal of the header table
+    for item in sorted(tree.header, key=tree.rank.__getitem__, reverse=True):
+        count = sum(node.count for node in tree.header[item])
+        if not is_frequent(count):
+            continue
+        itemset = suffix + (item,)
+        supports[itemset] = count
+
+        # Count items on the prefix paths, then build the conditional tree from the same paths
+        path_counts = {}
+        for node in tree.header[item]:
+            parent = node.parent
+            while parent.item is not None:
+                path_counts[parent.item] = path_counts.get(parent.item, 0) + node.count
+                parent = parent.parent
+        kept = {path_item: tree.rank[path_item] for path_item, path_count in path_counts.items()
+                if is_frequent(path_count)}
+        if not kept:
+            continue
+        conditional = FPTree(kept)
+        for path, path_count in tree.prefix_paths(item):
+            # Paths are already in rank order, so filtering keeps them sorted
+            conditional.insert([path_item for path_item in path if path_item in kept], path_count)
+        _mine(conditional, itemset, is_frequent, supports)
@@ -0,0 +1,100 @@
+import os
+import pickle
+import time
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+from utils import CSRTransactions, transactions_to_csr
+
+# Worker-side state: the attached shared blocks and a CSR view of them, kept for the life of the pool
+_worker = {}
+
+def _attach(items_name, num_items, offsets_name, num_offsets):
+    """Pool initializer: map the shared CSR arrays into this worker."""
+    items_block = SharedMemory(name=items_name)
+    offsets_block = SharedMemory(name=offsets_name)
+    _worker["blocks"] = (items_block, offsets_block)
+    _worker["transactions"] = CSRTransactions(
+        np.ndarray((num_items,), dtype=np.int32, buffer=items_block.buf),
+        np.ndarray((num_offsets,), dtype=np.int64, buffer=offsets_block.buf))
+
+def _partition_transactions(start, end):
+    """
+    Stream the transactions of the partition [start, end) straight from the shared arrays.
+    Each transaction becomes a set only while it is being counted, so a worker never holds the
+    partition (or any partition it counted earlier) as Python objects.
+    """
+    return (set(transaction) for transaction in _worker["transactions"][start:end])
+
+def _count_partition(counter, candidates, start, end):
+    """Count all candidates over one transaction partition; returns counts aligned with candidates."""
+    counts = counter(candidates, _partition_transactions(start, end))
+    return np.fromiter((counts[candidate] for candidate in candidates), dtype=np.int64, count=len(candidates))
+
+
+class ParallelCounter:
+    """
+    Support counting backend that lives for one mining run.
+    The transactions are copied once into shared memory as a CSR array pair (int32 items, int64
+    offsets) and a single worker pool attaches to them. Each level partitions the transactions
+    (not the candidates) across workers, ships only the candidate list, and sums the per-partition
+    count arrays. Small inputs are counted in-process without starting a pool.
+    """
+    def __init__(self, transactions, workers=None, min_parallel_transactions=20000):
+        self.transactions = transactions
+        self.workers = workers or os.cpu_count() or 1
+        self.parallel = self.workers > 1 and len(transactions) >= min_parallel_transactions
+        self.pool = None
+        self.blocks = []
+        if self.parallel:
+            self._start()
+
+    def _start(self):
+        items, offsets = transactions_to_csr(self.transactions)
+        shared = []
+        for array in (items, offsets):
+            block = SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+            self.blocks.append(block)
+            shared.extend([block.name, len(array)])
+        bounds = np.linspace(0, len(self.transactions), self.workers + 1).astype(int).tolist()
+        self.partitions = [(start, end) for start, end in zip(bounds[:-1], bounds[1:]) if end > start]
+        self.pool = Pool(self.workers, initializer=_attach, initargs=tuple(shared))
+
+    def count(self, candidates, counter, stats=None):
+        """
+        Count the support of each candidate with a per-chunk counter function
+        (counter(candidates, transactions) -> {candidate: count}).
+        If a stats dict is given, the size of the pickled tasks sent to the pool and the time taken
+        to pickle them are recorded in it as ipc_bytes and pickle_time.
+        """
+        candidates = list(dict.fromkeys(candidates))
+        if not candidates:
+            return {}
+        if not self.parallel:
+            return counter(candidates, self.transactions)
+        tasks = [(counter, candidates, start, end) for start, end in self.partitions]
+        if stats is not None:
+            # Pickled separately from the pool's own pickling, so this is only paid when profiling
+            start_time = time.perf_counter()
+            stats["ipc_bytes"] = sum(len(pickle.dumps(task)) for task in tasks)
+            stats["pickle_time"] = time.perf_counter() - start_time
+        results = self.pool.starmap(_count_partition, tasks)
+        totals = np.sum(results, axis=0)
+        return dict(zip(candidates, totals.tolist()))
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -3,20 +3,71 @@ import itertools
 def generate_rules(frequent_itemsets, transactions, min_confidence):
     """
     Generate association rules from frequent itemsets.
+    When frequent_itemsets is the {itemset: support count} map returned by apriori(return_counts=True)
+    or fp_growth(return_counts=True), supports are looked up instead of recounted and transactions
+    may be None.
     """
+    if isinstance(frequent_itemsets, dict):
+        return generate_rules_from_supports(frequent_itemsets, min_confidence)
+
     total_transactions = len(transactions)
     rules = []
+    support_cache = {}
+
+    def cached_support(itemset):
+        key = frozenset(itemset)
+        if key not in support_cache:
+            support_cache[key] = count_support(itemset, transactions)
+        return support_cache[key]
 
     for itemset in frequent_itemsets:
         if len(itemset) < 2:  # Skip itemsets that can't form rules
             continue
         for subset in map(set, itertools.chain.from_iterable(itertools.combinations(itemset, r) for r in range(1, len(itemset)))):
-            confidence = count_support(itemset, transactions) / count_support(subset, transactions)
+            confidence = cached_support(itemset) / cached_support(subset)
             if confidence >= min_confidence:
                 rules.append((subset, itemset - subset, confidence))
 
     return rules
 
+def generate_rules_from_supports(supports, min_confidence):
+    """
+    Generate association rules from an {itemset: support count} map without touching the data.
+    Consequents grow level-wise (ap-genrules): confidence only drops when items move from the
+    antecedent to the consequent, so an (m+1)-item consequent is tried only if all of its m-item
+    subsets already produced confident rules.
+    """
+    rules = []
+    for itemset, itemset_count in supports.items():
+        if len(itemset) < 2:  # Skip itemsets that can't form rules
+            continue
+        itemset = frozenset(itemset)
+        consequents = [frozenset([item]) for item in sorted(itemset)]
+        while consequents and len(consequents[0]) < len(itemset):
+            confident = []
+            for consequent in consequents:
+                antecedent = itemset - consequent
+                confidence = itemset_count / supports[antecedent]
+                if confidence >= min_confidence:
+                    rules.append((set(antecedent), consequent, confidence))
+                    confident.append(consequent)
+            consequents = _grow_consequents(confident)
+    return rules
+
+def _grow_consequents(consequents):
+    """Join m-item consequents sharing m-1 items into (m+1)-item ones whose m-subsets are all present."""
+    present = set(consequents)
+    ordered = sorted(tuple(sorted(consequent)) for consequent in consequents)
+    grown = []
+    for i in range(len(ordered)):
+        for j in range(i + 1, len(ordered)):
+            if ordered[i][:-1] != ordered[j][:-1]:
+                break  # Sorted order keeps a shared prefix contiguous
+            candidate = frozenset(ordered[i] + ordered[j][-1:])
+            if all(candidate - {item} in present for item in candidate):
+                grown.append(candidate)
+    return grown
+
 def count_support(itemset, transactions):
     """
     Count the support of an itemset in the transactions.
@@ -0,0 +1,103 @@
+import os
+from multiprocessing import Pool
+from apriori import apriori, count_candidates_trie
+from utils import CSRTransactions, parse_csr_block
+
+# Slack on the local threshold so float rounding of count / size can never drop a globally
+# frequent itemset in pass one; pass two re-checks every candidate exactly
+LOCAL_SUPPORT_SLACK = 1e-9
+
+# Worker-side candidates of pass two, grouped by size, set once per pool by the initializer
+_candidates = {}
+
+def chunk_ranges(filepath, chunk_size=1 << 24):
+    """
+    Split a dataset file into byte ranges of about chunk_size bytes, each ending on a line boundary,
+    so every chunk holds whole transactions and can be read independently.
+    """
+    size = os.path.getsize(filepath)
+    ranges = []
+    with open(filepath, "rb") as file:
+        start = 0
+        while start < size:
+            file.seek(min(start + chunk_size, size))
+            file.readline()  # Extend to the end of the line the boundary falls in
+            end = min(file.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+def _read_chunk(filepath, start, end):
+    """Parse one byte range of the dataset into CSRTransactions."""
+    with open(filepath, "rb") as file:
+        file.seek(start)
+        items, offsets = parse_csr_block(file.read(end - start))
+    return CSRTransactions(items, offsets)
+
+def _mine_chunk(filepath, start, end, min_support):
+    """Pass one: the itemsets frequent within one chunk at the (scaled) local support."""
+    transactions = _read_chunk(filepath, start, end)
+    local = apriori(transactions, min_support * (1 - LOCAL_SUPPORT_SLACK), engine="vertical", return_counts=True)
+    return len(transactions), list(local)
+
+def _set_candidates(candidates_by_size):
+    """Pool initializer for pass two: ship the global candidates to the worker once."""
+    _candidates.clear()
+    _candidates.update(candidates_by_size)
+
+def _count_chunk(filepath, start, end):
+    """Pass two: exact support of every global candidate within one chunk."""
+    transactions = _read_chunk(filepath, start, end)
+    counts = {}
+    for candidates in _candidates.values():
+        counts.update(count_candidates_trie(candidates, transactions))
+    return counts
+
+def son(filepath, min_support, workers=None, chunk_size=1 << 24, return_counts=False):
+    """
+    SON (Savasere-Omiecinski-Navathe) two-pass frequent itemset mining of a dataset file.
+    Pass one mines each chunk of the file on its own with apriori() at the same relative support
+    (the support count scaled to the chunk's size) and unions the results: an itemset frequent in
+    the whole file is frequent in at least one chunk, so the union holds every frequent itemset.
+    Pass two streams the chunks again and counts the exact support of those candidates.
+    Chunks are read by the worker processes themselves, so memory is bounded by chunk_size rather
+    than by the dataset size. The result matches apriori() on the whole dataset.
+    """
+    workers = workers or os.cpu_count() or 1
+    ranges = chunk_ranges(filepath, chunk_size)
+
+    # Pass 1: local frequent itemsets per chunk
+    tasks = [(filepath, start, end, min_support) for start, end in ranges]
+    if workers > 1 and len(ranges) > 1:
+        with Pool(workers) as pool:
+            local_results = pool.starmap(_mine_chunk, tasks)
+    else:
+        local_results = [_mine_chunk(*task) for task in tasks]
+    total_transactions = sum(size for size, _ in local_results)
+    if not total_transactions:
+        return {} if return_counts else []
+    candidates_by_size = {}
+    for _, itemsets in local_results:
+        for itemset in itemsets:
+            candidates_by_size.setdefault(len(itemset), set()).add(itemset)
+    candidates_by_size = {k: list(candidates) for k, candidates in sorted(candidates_by_size.items())}
+
+    # Pass 2: exact global counts of the candidates
+    tasks = [(filepath, start, end) for start, end in ranges]
+    if workers > 1 and len(ranges) > 1:
+        with Pool(workers, initializer=_set_candidates, initargs=(candidates_by_size,)) as pool:
+            chunk_counts = pool.starmap(_count_chunk, tasks)
+    else:
+        _set_candidates(candidates_by_size)
+        chunk_counts = [_count_chunk(*task) for task in tasks]
+    counts = {}
+    for chunk in chunk_counts:
+        for itemset, count in chunk.items():
+            counts[itemset] = counts.get(itemset, 0) + count
+
+    supports = {itemset: counts[itemset]
+                for candidates in candidates_by_size.values() for itemset in candidates
+                if counts[itemset] / total_transactions >= min_support}
+    if return_counts:
+        return supports
+    return [set(itemset) if len(itemset) == 1 else itemset for itemset in supports]
@@ -0,0 +1,70 @@
+import argparse
+import os
+import time
+from apriori import apriori
+from rule_generator import generate_rules
+from utils import load_transactions
+
+def filter_supports(supports, total_transactions, min_support):
+    """
+    Restrict an {itemset: support count} map mined at a lower threshold to the itemsets frequent at
+    min_support. Subsets of a frequent itemset are at least as frequent, so the result is exactly
+    what mining at min_support would return.
+    """
+    return {itemset: count for itemset, count in supports.items()
+            if count / total_transactions >= min_support}
+
+def sweep(transactions, min_supports, engine="vertical", workers=None):
+    """
+    Mine once at the lowest of several support thresholds and derive the others by filtering.
+    Returns {min_support: {itemset: support count}}.
+    """
+    total_transactions = len(transactions)
+    supports = apriori(transactions, min(min_supports), engine=engine, workers=workers, return_counts=True)
+    return {min_support: filter_supports(supports, total_transactions, min_support)
+            for min_support in sorted(min_supports)}
+
+def threshold_suffix(min_support):
+    """File name suffix of a threshold, as used in output/ (0.035 -> "0_035")."""
+    return str(min_support).replace(".", "_")
+
+def write_results(supports, min_support, min_confidence, output_dir="./output"):
+    """Write the frequent itemsets, 2-itemsets and association rules of one threshold."""
+    suffix = threshold_suffix(min_support)
+    frequent_itemsets = [set(itemset) if len(itemset) == 1 else itemset for itemset in supports]
+    with open(os.path.join(output_dir, f"frequent_itemsets{suffix}.txt"), "w") as file:
+        for itemset in sorted(frequent_itemsets, key=lambda x: (len(x), x)):
+            file.write(f"{itemset}\n")
+    with open(os.path.join(output_dir, f"2_itemsets{suffix}.txt"), "w") as file:
+        for itemset in frequent_itemsets:
+            if len(itemset) == 2:
+                file.write(f"{itemset}\n")
+    rules = generate_rules(supports, None, min_confidence)
+    with open(os.path.join(output_dir, f"association_rules{suffix}.txt"), "w") as file:
+        for antecedent, consequent, confidence in rules:
+            file.write(f"Rule: {antecedent} -> {consequent}, Confidence: {confidence:.2f}\n")
+    return rules
+
+def main():
+    parser = argparse.ArgumentParser(description="Mine frequent itemsets and rules for several support thresholds in one pass.")
+    parser.add_argument("--data", default="./data/T10I4D100K.dat")
+    parser.add_argument("--supports", type=float, nargs="+", default=[0.01, 0.02, 0.035, 0.05])
+    parser.add_argument("--confidence", type=float, default=0.6)
+    parser.add_argument("--engine", choices=["horizontal", "trie", "vertical"], default="vertical")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output-dir", default="./output")
+    args = parser.parse_args()
+
+    transactions = load_transactions(args.data)
+    start = time.perf_counter()
+    results = sweep(transactions, args.supports, args.engine, args.workers)
+    print(f"Mined {len(args.supports)} thresholds in {time.perf_counter() - start:.2f}s "
+          f"(one pass at s={min(args.supports)})")
+    os.makedirs(args.output_dir, exist_ok=True)
+    for min_support, supports in results.items():
+        rules = write_results(supports, min_support, args.confidence, args.output_dir)
+        print(f"s={min_support}: {len(supports)} frequent itemsets, {len(rules)} rules "
+              f"-> {args.output_dir}/*{threshold_suffix(min_support)}.txt")
+
+if __name__ == "__main__":
+    main()
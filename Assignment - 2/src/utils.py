@@ -1,3 +1,5 @@
+import os
+import numpy as np
 from collections import Counter
 
 def load_dataset(filepath):
@@ -11,11 +13,159 @@ def load_dataset(filepath):
             transactions.append(transaction)
     return transactions
 
+class CSRTransactions:
+    """
+    Read-only sequence of transactions stored in CSR layout: an int32 array of every transaction's
+    sorted, unique items and an int64 offsets array where transaction t spans
+    items[offsets[t]:offsets[t + 1]]. The arrays may be memory-mapped. Iterating yields each
+    transaction as a list of ints, so existing counters can consume it without a list of sets.
+    """
+    def __init__(self, items, offsets):
+        self.items = items
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __iter__(self):
+        items = self.items
+        bounds = self.offsets.tolist()
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            yield items[start:end].tolist()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("CSRTransactions only supports contiguous slices")
+            stop = max(stop, start)
+            offsets = self.offsets[start:stop + 1]
+            return CSRTransactions(self.items[offsets[0]:offsets[-1]], offsets - offsets[0])
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return self.items[start:end].tolist()
+
+def parse_csr_block(block):
+    """
+    Parse a bytes block of transactions (one line of non-negative integers per transaction) into
+    CSR arrays with vectorized NumPy operations instead of per-token int() calls.
+    """
+    data = np.frombuffer(block, dtype=np.uint8)
+    newlines = np.flatnonzero(data == ord("\n"))
+    num_lines = len(newlines) + (1 if len(data) and data[-1] != ord("\n") else 0)
+    # Digit runs are the tokens: +1 edges start a token, -1 edges end one
+    edges = np.diff(((data >= ord("0")) & (data <= ord("9"))).astype(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    lengths = np.flatnonzero(edges == -1) - starts
+    values = np.zeros(len(starts), dtype=np.int64)
+    for position in range(int(lengths.max()) if len(lengths) else 0):
+        active = position < lengths
+        values[active] = values[active] * 10 + (data[starts[active] + position] - ord("0"))
+    lines = np.searchsorted(newlines, starts)
+    # Sort items within each line and drop repeats, matching the sets load_dataset() builds
+    order = np.lexsort((values, lines))
+    values, lines = values[order], lines[order]
+    keep = np.ones(len(values), dtype=bool)
+    keep[1:] = (values[1:] != values[:-1]) | (lines[1:] != lines[:-1])
+    values, lines = values[keep], lines[keep]
+    offsets = np.zeros(num_lines + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(np.bincount(lines, minlength=num_lines))
+    return values.astype(np.int32), offsets
+
+def iter_csr_blocks(filepath, block_size=1 << 24):
+    """
+    Stream a dataset as CSR blocks of whole lines, reading block_size bytes at a time and carrying
+    a line cut by the block edge into the next block.
+    """
+    remainder = b""
+    with open(filepath, "rb") as file:
+        while True:
+            block = file.read(block_size)
+            if not block:
+                break
+            block = remainder + block
+            cut = block.rfind(b"\n") + 1
+            remainder = block[cut:]
+            if cut:
+                yield parse_csr_block(block[:cut])
+    if remainder:
+        yield parse_csr_block(remainder)
+
+def load_transactions(filepath, block_size=1 << 24, cache=True):
+    """
+    Load a dataset as CSRTransactions.
+    The parsed arrays are cached next to the dataset as .npy files and memory-mapped on later runs,
+    skipping text parsing; the cache is rebuilt when the dataset is newer than it.
+    """
+    items_path, offsets_path = filepath + ".csr-items.npy", filepath + ".csr-offsets.npy"
+    if cache and all(os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(filepath)
+                     for path in (items_path, offsets_path)):
+        return CSRTransactions(np.load(items_path, mmap_mode="r"), np.load(offsets_path, mmap_mode="r"))
+
+    item_blocks, offsets = [], [np.zeros(1, dtype=np.int64)]
+    for block_items, block_offsets in iter_csr_blocks(filepath, block_size):
+        offsets.append(block_offsets[1:] + offsets[-1][-1])
+        item_blocks.append(block_items)
+    items = np.concatenate(item_blocks) if item_blocks else np.zeros(0, dtype=np.int32)
+    offsets = np.concatenate(offsets)
+    if cache:
+        for path, array in ((items_path, items), (offsets_path, offsets)):
+            with open(path + ".tmp", "wb") as file:
+                np.save(file, array)
+            os.replace(path + ".tmp", path)
+    return CSRTransactions(items, offsets)
+
 def get_item_counts(transactions):
     """
     Count the frequency of each item across all transactions.
     """
+    if isinstance(transactions, CSRTransactions):
+        counts = np.bincount(transactions.items) if len(transactions.items) else np.zeros(0, dtype=np.int64)
+        present = np.flatnonzero(counts)
+        return Counter(dict(zip(present.tolist(), counts[present].tolist())))
     item_counts = Counter()
     for transaction in transactions:
         item_counts.update(transaction)
     return item_counts
+
+def build_tid_bitmaps(transactions, items):
+    """
+    Build a vertical (TID-bitmap) view of the transactions for the given items.
+    Bit t of an item's bitmap (a Python int) is set when transaction t contains the item,
+    so the support of an itemset is the popcount of the AND of its items' bitmaps.
+    """
+    if isinstance(transactions, CSRTransactions):
+        return _csr_tid_bitmaps(transactions, items)
+    size = (len(transactions) + 7) // 8
+    bitmaps = {item: bytearray(size) for item in items}
+    for tid, transaction in enumerate(transactions):
+        byte, bit = tid >> 3, 1 << (tid & 7)
+        for item in transaction:
+            if item in bitmaps:
+                bitmaps[item][byte] |= bit
+    return {item: int.from_bytes(bitmap, 'little') for item, bitmap in bitmaps.items()}
+
+def _csr_tid_bitmaps(transactions, items):
+    """TID bitmaps from CSR arrays: one stable sort groups every item's transaction ids."""
+    tids = np.repeat(np.arange(len(transactions)), np.diff(transactions.offsets))
+    order = np.argsort(transactions.items, kind="stable")
+    sorted_items = transactions.items[order]
+    bitmaps = {}
+    for item in items:
+        start, end = np.searchsorted(sorted_items, [item, item + 1])
+        bits = np.zeros(len(transactions), dtype=bool)
+        bits[tids[order[start:end]]] = True
+        bitmaps[item] = int.from_bytes(np.packbits(bits, bitorder="little").tobytes(), "little")
+    return bitmaps
+
+def transactions_to_csr(transactions):
+    """
+    Flatten transactions into a CSR layout: one int32 array of all items (each transaction's items
+    sorted) and an int64 offsets array where transaction t spans items[offsets[t]:offsets[t + 1]].
+    """
+    if isinstance(transactions, CSRTransactions):
+        return np.asarray(transactions.items), np.asarray(transactions.offsets)
+    offsets = np.zeros(len(transactions) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(transaction) for transaction in transactions])
+    items = np.fromiter((item for transaction in transactions for item in sorted(transaction)),
+                        dtype=np.int32, count=int(offsets[-1]))
+    return items, offsets
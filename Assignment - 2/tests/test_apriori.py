@@ -1,17 +1,116 @@
+import itertools
+import os
+import tempfile
 import unittest
-from src.apriori import apriori
-from src.utils import load_dataset
+from src.apriori import apriori, generate_candidates, count_candidates_chunk, count_candidates_trie
+from src.utils import load_dataset, load_transactions, get_item_counts
+from src.parallel_counter import ParallelCounter
+from src.fp_growth import fp_growth
+from src.rule_generator import generate_rules
+from src.son import son
+from src.sweep import sweep
 
 class TestApriori(unittest.TestCase):
     def test_frequent_itemsets(self):
         transactions = [{1, 2}, {1, 2, 3}, {1, 3}, {2, 3}]
         min_support = 0.5
         frequent_itemsets = apriori(transactions, min_support)
-        expected = [{1}, {2}, {3}, {1, 2}, {2, 3}]
+        expected = [{1}, {2}, {3}, {1, 2}, {1, 3}, {2, 3}]
         self.assertEqual(set(map(frozenset, frequent_itemsets)), set(map(frozenset, expected)))
 
+    def test_vertical_engine_matches_exact_support(self):
+        transactions = [{1, 2, 5}, {1, 2, 3}, {1, 3, 5}, {2, 3}, {1, 2, 3, 5}, {2, 5}]
+        min_support = 0.3
+        items = sorted(set().union(*transactions))
+        expected = {
+            frozenset(itemset)
+            for k in range(1, len(items) + 1)
+            for itemset in itertools.combinations(items, k)
+            if sum(1 for t in transactions if set(itemset) <= t) / len(transactions) >= min_support
+        }
+        frequent_itemsets = apriori(transactions, min_support, engine="vertical")
+        self.assertEqual(set(map(frozenset, frequent_itemsets)), expected)
+
+    def test_generate_candidates_prunes_and_deduplicates(self):
+        itemsets = [frozenset(s) for s in ({1, 2}, {1, 3}, {2, 3}, {1, 4}, {3, 4})]
+        stats = {}
+        candidates = generate_candidates(itemsets, 3, stats)
+        # Prefix {1} joins to {1, 2, 3}, {1, 2, 4} and {1, 3, 4}; {1, 2, 4} is pruned since {2, 4} is infrequent
+        self.assertEqual(candidates, [frozenset({1, 2, 3}), frozenset({1, 3, 4})])
+        self.assertEqual(stats, {"generated": 3, "pruned": 1})
+
+    def test_trie_counter_matches_subset_scan(self):
+        transactions = [{1, 2, 3, 4}, {2, 3, 4}, {1, 4}, {1, 2, 4}, {3}]
+        candidates = [frozenset(s) for s in ({1, 2, 4}, {2, 3, 4}, {1, 3, 4}, {1, 2, 3})]
+        self.assertEqual(count_candidates_trie(candidates, transactions),
+                         count_candidates_chunk(candidates, transactions))
+
+    def test_parallel_counter_matches_serial_counts(self):
+        transactions = [{1, 2, 3, 4}, {2, 3, 4}, {1, 4}, {1, 2, 4}, {3}, {2, 4}, {1, 2}]
+        candidates = [frozenset(s) for s in ({1, 2}, {2, 4}, {3, 4}, {1, 3})]
+        with ParallelCounter(transactions, workers=2, min_parallel_transactions=0) as counter:
+            self.assertTrue(counter.parallel)
+            counts = counter.count(candidates, count_candidates_trie)
+        self.assertEqual(counts, count_candidates_chunk(candidates, transactions))
+
+    def test_fp_growth_matches_apriori(self):
+        transactions = [{1, 2, 5}, {2, 4}, {2, 3}, {1, 2, 4}, {1, 3}, {2, 3}, {1, 3}, {1, 2, 3, 5}, {1, 2, 3}]
+        for min_support in (0.2, 0.3, 0.5):
+            expected = apriori(transactions, min_support, engine="vertical")
+            self.assertEqual(set(map(frozenset, fp_growth(transactions, min_support))),
+                             set(map(frozenset, expected)))
+
+    def test_rules_from_supports_match_rescanning(self):
+        transactions = [{1, 2, 5}, {2, 4}, {2, 3}, {1, 2, 4}, {1, 3}, {2, 3}, {1, 3}, {1, 2, 3, 5}, {1, 2, 3}]
+        supports = apriori(transactions, 0.2, engine="vertical", return_counts=True)
+        self.assertEqual(supports[frozenset({1, 2})], 4)
+
+        def normalize(rules):
+            return sorted((sorted(antecedent), sorted(consequent), round(confidence, 9))
+                          for antecedent, consequent, confidence in rules)
+
+        for min_confidence in (0.0, 0.5, 1.0):
+            expected = generate_rules(list(supports), transactions, min_confidence)
+            self.assertEqual(normalize(generate_rules(supports, None, min_confidence)), normalize(expected))
+
+    def test_csr_loader_matches_load_dataset(self):
+        lines = ["1 2 5", "2 4 4", "", "3 2", "10 1 2 3 5"]
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, "transactions.dat")
+            with open(filepath, "w") as file:
+                file.write("\n".join(lines))  # No trailing newline on the last transaction
+            expected = load_dataset(filepath)
+            # A tiny block size forces transactions to be split across block edges
+            parsed = load_transactions(filepath, block_size=3)
+            cached = load_transactions(filepath)
+        self.assertEqual([set(transaction) for transaction in parsed], expected)
+        self.assertEqual([set(transaction) for transaction in cached], expected)
+        self.assertEqual(get_item_counts(cached), get_item_counts(expected))
+        for engine in ("horizontal", "trie", "vertical"):
+            self.assertEqual(set(map(frozenset, apriori(cached, 0.4, engine=engine))),
+                             set(map(frozenset, apriori(expected, 0.4, engine=engine))))
+
+    def test_son_matches_apriori(self):
+        transactions = [{1, 2, 5}, {2, 4}, {2, 3}, {1, 2, 4}, {1, 3}, {2, 3}, {1, 3}, {1, 2, 3, 5}, {1, 2, 3}]
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, "transactions.dat")
+            with open(filepath, "w") as file:
+                file.writelines(" ".join(map(str, sorted(transaction))) + "\n" for transaction in transactions)
+            for min_support in (0.2, 0.3, 0.5):
+                expected = apriori(transactions, min_support, engine="vertical", return_counts=True)
+                # Chunks of a few lines each, so every chunk is mined and counted separately
+                self.assertEqual(son(filepath, min_support, workers=1, chunk_size=10, return_counts=True), expected)
+                self.assertEqual(son(filepath, min_support, workers=2, chunk_size=10, return_counts=True), expected)
+
+    def test_sweep_matches_mining_each_threshold(self):
+        transactions = [{1, 2, 5}, {2, 4}, {2, 3}, {1, 2, 4}, {1, 3}, {2, 3}, {1, 3}, {1, 2, 3, 5}, {1, 2, 3}]
+        results = sweep(transactions, [0.5, 0.2, 0.3])
+        self.assertEqual(list(results), [0.2, 0.3, 0.5])
+        for min_support, supports in results.items():
+            self.assertEqual(supports, apriori(transactions, min_support, engine="vertical", return_counts=True))
+
     def test_dataset_loading(self):
-        filepath = "../data/sample_data.dat"  # Replace with a small sample file
+        filepath = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "sample_data.dat")
         transactions = load_dataset(filepath)
         self.assertIsInstance(transactions, list)
         self.assertGreater(len(transactions), 0)
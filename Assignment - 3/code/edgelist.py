@@ -0,0 +1,140 @@
+"""
+Compact binary edge lists shared by the graph assignments (Assignment 4's scripts import this
+module from Assignment 3's code/ directory).
+
+Text edge lists (whitespace- or comma-separated, optional third weight column, '#'/'%' comment
+lines) are parsed in bulk into int32 src/dst arrays with node ids remapped to 0..n-1. The result
+is cached next to the source in <file>.edgecache/ as .npy files that later runs memory-map; the
+cache is keyed by the source file's size and modification time and rebuilt when either changes.
+It also holds the endpoints with repeated undirected edges removed (unique_*.npy), so a
+deduplicated stream is memory-mapped too.
+"""
+import json
+import os
+from collections import namedtuple
+import numpy as np
+
+EdgeList = namedtuple('EdgeList', ['src', 'dst', 'node_ids', 'weights'])
+EdgeList.__doc__ = """Dense int32 endpoints, the original id of each dense node, and the weights (or None)."""
+
+def parse_edge_block(block, num_columns=None):
+    """
+    Parse a bytes block of whole edge lines into (src int64, dst int64, weights float64 or None),
+    with original node ids. num_columns defaults to the column count of the block's first line.
+    """
+    if b'#' in block or b'%' in block:
+        block = b'\n'.join(line for line in block.splitlines() if not line.lstrip().startswith((b'#', b'%')))
+    tokens = block.replace(b',', b' ').split()
+    if num_columns is None:
+        first_line = next((line for line in block.splitlines() if line.strip()), b'')
+        num_columns = max(len(first_line.replace(b',', b' ').split()), 2)
+    if len(tokens) % num_columns:
+        raise ValueError(f"Edge list lines must all have {num_columns} columns")
+    table = np.array(tokens, dtype=np.bytes_).reshape(-1, num_columns)
+    weights = table[:, 2].astype(np.float64) if num_columns >= 3 else None
+    return table[:, 0].astype(np.int64), table[:, 1].astype(np.int64), weights
+
+def _first_line_columns(filepath):
+    with open(filepath, 'rb') as file:
+        for line in file:
+            if line.strip() and not line.lstrip().startswith((b'#', b'%')):
+                return max(len(line.replace(b',', b' ').split()), 2)
+    return 2
+
+def _iter_text_blocks(filepath, block_size):
+    """Yield blocks of whole lines of about block_size bytes."""
+    remainder = b''
+    with open(filepath, 'rb') as file:
+        while True:
+            block = file.read(block_size)
+            if not block:
+                break
+            block = remainder + block
+            cut = block.rfind(b'\n') + 1
+            remainder = block[cut:]
+            if cut:
+                yield block[:cut]
+    if remainder.strip():
+        yield remainder
+
+def parse_edge_list(filepath, block_size=1 << 24):
+    """Parse a text edge list into an EdgeList without touching the cache."""
+    num_columns = _first_line_columns(filepath)
+    sources, targets, weights = [], [], []
+    for block in _iter_text_blocks(filepath, block_size):
+        src, dst, block_weights = parse_edge_block(block, num_columns)
+        sources.append(src)
+        targets.append(dst)
+        if block_weights is not None:
+            weights.append(block_weights)
+    src = np.concatenate(sources) if sources else np.zeros(0, dtype=np.int64)
+    dst = np.concatenate(targets) if targets else np.zeros(0, dtype=np.int64)
+    # Dense remap: node_ids[dense] is the original id
+    node_ids, dense = np.unique(np.concatenate([src, dst]), return_inverse=True)
+    dense = dense.astype(np.int32)
+    return EdgeList(dense[:len(src)], dense[len(src):], node_ids,
+                    np.concatenate(weights) if num_columns >= 3 and weights else None)
+
+def unique_edges(edges):
+    """
+    Drop repeated undirected edges, in either direction, keeping each edge's first occurrence in
+    file order (directed lists such as email-Eu-core hold both (u, v) and (v, u)).
+    """
+    src, dst = np.asarray(edges.src, dtype=np.int64), np.asarray(edges.dst, dtype=np.int64)
+    keys = np.minimum(src, dst) << 32 | np.maximum(src, dst)
+    first = np.sort(np.unique(keys, return_index=True)[1])
+    weights = np.asarray(edges.weights)[first] if edges.weights is not None else None
+    return EdgeList(np.asarray(edges.src)[first], np.asarray(edges.dst)[first], edges.node_ids, weights)
+
+def load_edge_list(filepath, cache=True, block_size=1 << 24, unique=False):
+    """
+    Load an edge list, memory-mapping the binary cache when it matches the source file and
+    (re)building it otherwise. With unique=True repeated undirected edges are left out; the cache
+    stores both the full and the deduplicated endpoints, so either is memory-mapped.
+    """
+    cache_dir = filepath + '.edgecache'
+    stat = os.stat(filepath)
+    key = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    meta_path = os.path.join(cache_dir, 'meta.json')
+    prefix = 'unique_' if unique else ''
+    if cache and os.path.exists(meta_path):
+        with open(meta_path) as file:
+            meta = json.load(file)
+        # Caches written before the deduplicated arrays existed are rebuilt
+        if meta.get('source') == key and 'num_unique_edges' in meta:
+            arrays = {name: np.load(os.path.join(cache_dir, f'{name}.npy'), mmap_mode='r')
+                      for name in (f'{prefix}src', f'{prefix}dst', 'node_ids')}
+            weights = (np.load(os.path.join(cache_dir, f'{prefix}weights.npy'), mmap_mode='r')
+                       if meta.get('weighted') else None)
+            return EdgeList(arrays[f'{prefix}src'], arrays[f'{prefix}dst'], arrays['node_ids'], weights)
+
+    edges = parse_edge_list(filepath, block_size)
+    if not cache:
+        return unique_edges(edges) if unique else edges
+    deduplicated = unique_edges(edges)
+    os.makedirs(cache_dir, exist_ok=True)
+    if os.path.exists(meta_path):
+        os.remove(meta_path)  # Invalidate before overwriting the arrays
+    for name, array in edges._asdict().items():
+        if array is not None:
+            np.save(os.path.join(cache_dir, f'{name}.npy'), array)
+    for name in ('src', 'dst', 'weights'):
+        if getattr(deduplicated, name) is not None:
+            np.save(os.path.join(cache_dir, f'unique_{name}.npy'), getattr(deduplicated, name))
+    with open(meta_path, 'w') as file:
+        json.dump({'source': key, 'weighted': edges.weights is not None, 'num_edges': len(edges.src),
+                   'num_unique_edges': len(deduplicated.src), 'num_nodes': len(edges.node_ids)}, file)
+    return deduplicated if unique else edges
+
+def edge_chunks(edges, chunk_size=1 << 16):
+    """Yield (src, dst) slices of at most chunk_size edges of an EdgeList, in order."""
+    for start in range(0, len(edges.src), chunk_size):
+        yield np.asarray(edges.src[start:start + chunk_size]), np.asarray(edges.dst[start:start + chunk_size])
+
+def iter_edge_chunks(filepath, chunk_size=1 << 16, cache=True, unique=False):
+    """
+    Yield (src, dst) dense int32 array slices of at most chunk_size edges, in file order.
+    Once the cache exists the slices are read from memory-mapped files, so a streaming consumer
+    only holds one chunk at a time (with or without unique).
+    """
+    yield from edge_chunks(load_edge_list(filepath, cache, unique=unique), chunk_size)
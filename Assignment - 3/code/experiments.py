@@ -0,0 +1,134 @@
+import argparse
+import json
+import os
+import statistics
+import time
+from multiprocessing import Pool
+import numpy as np
+from edgelist import load_edge_list
+from triest import TriestEstimator
+from utils import count_wedges_and_closed_wedges
+
+DATASETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'datasets')
+DEFAULT_DATASETS = [os.path.join(DATASETS_DIR, 'facebook_combined.txt'),
+                    os.path.join(DATASETS_DIR, 'email-Eu-core.txt')]
+EXACT_CACHE = os.path.join(DATASETS_DIR, '.exact_transitivity.json')
+
+# Worker-side edge streams, set once per worker by the pool initializer
+_streams = {}
+
+def load_edge_array(graph_file):
+    """
+    Load an edge list as an (edges x 2) int32 array of dense node ids (transitivity ignores labels),
+    each undirected edge once.
+    """
+    edges = load_edge_list(graph_file, unique=True)
+    return np.column_stack((edges.src, edges.dst))
+
+def exact_transitivity(graph_file, edges, cache_path=EXACT_CACHE):
+    """
+    Exact transitivity of a dataset (self-loops ignored), cached on disk by file path, size and
+    modification time so it is computed once per dataset version.
+    """
+    stat = os.stat(graph_file)
+    key = f"{os.path.abspath(graph_file)}:{stat.st_size}:{stat.st_mtime_ns}"
+    cache = {}
+    if os.path.exists(cache_path):
+        with open(cache_path) as file:
+            cache = json.load(file)
+    if key not in cache:
+        loop_free = edges[edges[:, 0] != edges[:, 1]]
+        wedges, closed_wedges = count_wedges_and_closed_wedges(loop_free.tolist())
+        # closed_wedges already counts every triangle 3 times
+        cache[key] = closed_wedges / wedges if wedges else 0.0
+        with open(cache_path, 'w') as file:
+            json.dump(cache, file, indent=2)
+    return cache[key]
+
+def _set_streams(streams):
+    _streams.clear()
+    _streams.update(streams)
+
+def run_trial(graph_file, reservoir_size, seed, improved=False):
+    """One independent TRIEST run over a dataset's edge stream; returns the transitivity estimate."""
+    stream = _streams[graph_file]
+    if not isinstance(stream, list):
+        # Convert the shared array once per worker; Python ints are faster to hash than NumPy scalars
+        stream = _streams[graph_file] = stream.tolist()
+    estimator = TriestEstimator(reservoir_size, improved=improved, seed=seed)
+    return estimator.update_many(stream).transitivity()
+
+def confidence_interval(values, confidence=0.95):
+    """Two-sided confidence interval of the mean (Student t if scipy is available, else normal)."""
+    mean = statistics.fmean(values)
+    if len(values) < 2:
+        return mean, mean
+    try:
+        from scipy.stats import t
+        critical = t.ppf((1 + confidence) / 2, len(values) - 1)
+    except ImportError:
+        critical = statistics.NormalDist().inv_cdf((1 + confidence) / 2)
+    half_width = critical * statistics.stdev(values) / len(values) ** 0.5
+    return mean - half_width, mean + half_width
+
+def run_experiments(datasets, reservoir_sizes, trials=5, workers=None, improved=False, seed=0,
+                    cache_path=EXACT_CACHE):
+    """
+    Run trials x reservoir sizes x datasets TRIEST estimates across a process pool.
+    Each dataset is loaded once and shipped once to every worker; every trial has its own seed.
+    Returns one summary dict per (dataset, reservoir size).
+    """
+    streams = {graph_file: load_edge_array(graph_file) for graph_file in datasets}
+    tasks = [(graph_file, reservoir_size, seed + index * 1000003 + size_index * 1009 + trial, improved)
+             for index, graph_file in enumerate(datasets)
+             for size_index, reservoir_size in enumerate(reservoir_sizes)
+             for trial in range(trials)]
+    workers = workers or os.cpu_count() or 1
+    if workers > 1:
+        with Pool(workers, initializer=_set_streams, initargs=(streams,)) as pool:
+            estimates = pool.starmap(run_trial, tasks)
+    else:
+        _set_streams(streams)
+        estimates = [run_trial(*task) for task in tasks]
+
+    results = []
+    for index, graph_file in enumerate(datasets):
+        exact = exact_transitivity(graph_file, streams[graph_file], cache_path)
+        for size_index, reservoir_size in enumerate(reservoir_sizes):
+            start = (index * len(reservoir_sizes) + size_index) * trials
+            values = estimates[start:start + trials]
+            mean = statistics.fmean(values)
+            low, high = confidence_interval(values)
+            results.append({
+                'dataset': os.path.basename(graph_file), 'reservoir_size': reservoir_size, 'trials': trials,
+                'estimates': values, 'mean': mean,
+                'variance': statistics.variance(values) if trials > 1 else 0.0,
+                'ci_low': low, 'ci_high': high, 'exact': exact,
+                'relative_error': abs(mean - exact) / exact if exact else None,
+            })
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel TRIEST transitivity experiments.")
+    parser.add_argument('--datasets', nargs='+', default=DEFAULT_DATASETS)
+    parser.add_argument('--reservoir-sizes', type=int, nargs='+', default=[5000, 10000, 15000, 20000])
+    parser.add_argument('--trials', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--improved', action='store_true', help="Use TRIEST-IMPR")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help="Also write the results to this file")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = run_experiments(args.datasets, args.reservoir_sizes, args.trials, args.workers, args.improved, args.seed)
+    for result in results:
+        print(f"{result['dataset']:>22} M={result['reservoir_size']:<6} mean={result['mean']:.4f} "
+              f"var={result['variance']:.2e} 95% CI=[{result['ci_low']:.4f}, {result['ci_high']:.4f}] "
+              f"exact={result['exact']:.4f} rel.err={(result['relative_error'] or 0) * 100:.2f}%")
+    print(f"\n{len(results) * args.trials} trials in {time.perf_counter() - start:.1f}s")
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(results, file, indent=2)
+
+if __name__ == '__main__':
+    main()
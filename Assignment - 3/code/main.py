@@ -1,14 +1,10 @@
-from utils import reservoir_sampling, count_wedges_and_closed_wedges, estimate_transitivity
+from utils import stream_edges
+from triest import TriestEstimator
 import networkx as nx
 
-def process_dataset(graph_file, reservoir_size, iterations=5):
+def process_dataset(graph_file, reservoir_size, iterations=5, improved=False):
     
     print(f"\nProcessing dataset: {graph_file}")
-    
-    # Load the graph dataset
-    G = nx.read_edgelist(graph_file, nodetype=int, create_using=nx.Graph())
-    edge_stream = list(G.edges())
-    print(f"Loaded graph with {len(G.nodes())} nodes and {len(edge_stream)} edges.")
 
     # Store estimated transitivity values across iterations
     estimated_transitivity_values = []
@@ -16,17 +12,15 @@ def process_dataset(graph_file, reservoir_size, iterations=5):
     for i in range(iterations):
         print(f"\nIteration {i + 1}/{iterations}")
         
-        # Perform reservoir sampling
-        reservoir = reservoir_sampling(edge_stream, reservoir_size)
-        print(f"Sampled {len(reservoir)} edges into the reservoir.")
-
-        # Count wedges and closed wedges
-        wedge_count, closed_wedge_count = count_wedges_and_closed_wedges(reservoir)
-        print(f"Total wedges: {wedge_count}")
-        print(f"Closed wedges (triangles): {closed_wedge_count}")
+        # Stream the edges straight from the file through the TRIEST reservoir
+        estimator = TriestEstimator(reservoir_size, improved=improved)
+        estimator.update_many(stream_edges(graph_file))
+        print(f"Streamed {estimator.edges_seen} edges, {len(estimator.edges)} edges in the reservoir.")
+        print(f"Estimated wedges: {estimator.wedge_estimate():.0f}")
+        print(f"Estimated triangles: {estimator.triangle_estimate():.0f}")
 
         # Estimate transitivity
-        estimated_transitivity = estimate_transitivity(wedge_count, closed_wedge_count)
+        estimated_transitivity = estimator.transitivity()
         estimated_transitivity_values.append(estimated_transitivity)
         print(f"Estimated Transitivity (Iteration {i + 1}): {estimated_transitivity}")
 
@@ -34,7 +28,8 @@ def process_dataset(graph_file, reservoir_size, iterations=5):
     average_estimated_transitivity = sum(estimated_transitivity_values) / iterations
     print(f"\nAverage Estimated Transitivity: {average_estimated_transitivity}")
 
-    # Compare with exact transitivity
+    # Compare with exact transitivity (the only step that loads the whole graph)
+    G = nx.read_edgelist(graph_file, nodetype=int, create_using=nx.Graph())
     exact_transitivity = nx.transitivity(G)
     print(f"Exact Transitivity: {exact_transitivity}")
     print(f"Absolute Error: {abs(average_estimated_transitivity - exact_transitivity)}")
@@ -0,0 +1,130 @@
+import random
+
+class TriestEstimator:
+    """
+    Single-pass TRIEST estimator (De Stefani et al., KDD 2016) of the triangle count, wedge count
+    and transitivity of an edge stream.
+
+    A uniform reservoir of at most reservoir_size edges is kept as adjacency sets, so memory is
+    O(reservoir_size) however long the stream is. With the base variant, the sample's triangle and
+    wedge counts are updated on every insertion and eviction and scaled by the inverse probability
+    that a triangle (3 edges) or wedge (2 edges) survives in the sample. With improved=True
+    (TRIEST-IMPR), counters are never decremented: every arriving edge adds the triangles and
+    wedges it closes with the sample, weighted by the inverse probability that the sampled edges
+    involved are in the reservoir, which lowers the variance.
+    Self-loops and repeats of an edge that is currently sampled are ignored; otherwise the stream is
+    assumed to contain each undirected edge once.
+    """
+    def __init__(self, reservoir_size, improved=False, seed=None):
+        if reservoir_size < 3:
+            raise ValueError("reservoir_size must be at least 3 to hold a triangle")
+        self.reservoir_size = reservoir_size
+        self.improved = improved
+        self.random = random.Random(seed)
+        self.adjacency = {}
+        self.edges = []  # Sampled edges, indexed so a uniform eviction is O(1)
+        self.edge_index = {}
+        self.edges_seen = 0
+        self.triangles = 0.0  # Base: triangles in the sample; improved: running estimate
+        self.wedges = 0.0
+
+    def update(self, u, v):
+        """Process one edge of the stream."""
+        if u == v:
+            return
+        edge = (u, v) if u < v else (v, u)
+        if edge in self.edge_index:
+            return
+        self.edges_seen += 1
+        t, m = self.edges_seen, self.reservoir_size
+
+        if self.improved:
+            # The other edges of a closed triangle / wedge are sampled with probability ~ (m / (t - 1))^k
+            triangle_weight = max(1.0, (t - 1) * (t - 2) / (m * (m - 1)))
+            wedge_weight = max(1.0, (t - 1) / m)
+            self.triangles += triangle_weight * self._common_neighbors(u, v)
+            self.wedges += wedge_weight * (self._degree(u) + self._degree(v))
+
+        if t <= m:
+            self._insert(edge)
+        elif self.random.random() < m / t:
+            self._evict(self.edges[self.random.randrange(m)])
+            self._insert(edge)
+
+    def update_many(self, edges):
+        for u, v in edges:
+            self.update(u, v)
+        return self
+
+    def triangle_estimate(self):
+        """Unbiased estimate of the number of triangles in the stream so far."""
+        if self.improved:
+            return self.triangles
+        t, m = self.edges_seen, self.reservoir_size
+        return self.triangles * max(1.0, t * (t - 1) * (t - 2) / (m * (m - 1) * (m - 2)))
+
+    def wedge_estimate(self):
+        """Unbiased estimate of the number of wedges (paths of length 2) in the stream so far."""
+        if self.improved:
+            return self.wedges
+        t, m = self.edges_seen, self.reservoir_size
+        return self.wedges * max(1.0, t * (t - 1) / (m * (m - 1)))
+
+    def transitivity(self):
+        """Current transitivity estimate: 3 * triangles / wedges."""
+        wedges = self.wedge_estimate()
+        return 3 * self.triangle_estimate() / wedges if wedges else 0.0
+
+    def _degree(self, node):
+        neighbors = self.adjacency.get(node)
+        return len(neighbors) if neighbors else 0
+
+    def _common_neighbors(self, u, v):
+        first, second = self.adjacency.get(u), self.adjacency.get(v)
+        if not first or not second:
+            return 0
+        if len(first) > len(second):
+            first, second = second, first
+        return sum(1 for node in first if node in second)
+
+    def _insert(self, edge):
+        u, v = edge
+        if not self.improved:
+            self.triangles += self._common_neighbors(u, v)
+            self.wedges += self._degree(u) + self._degree(v)
+        self.adjacency.setdefault(u, set()).add(v)
+        self.adjacency.setdefault(v, set()).add(u)
+        self.edge_index[edge] = len(self.edges)
+        self.edges.append(edge)
+
+    def _evict(self, edge):
+        u, v = edge
+        self.adjacency[u].discard(v)
+        self.adjacency[v].discard(u)
+        if not self.improved:
+            self.triangles -= self._common_neighbors(u, v)
+            self.wedges -= self._degree(u) + self._degree(v)
+        for node in edge:
+            if not self.adjacency[node]:
+                del self.adjacency[node]
+        # Swap-remove from the edge list
+        position = self.edge_index.pop(edge)
+        last = self.edges.pop()
+        if last != edge:
+            self.edges[position] = last
+            self.edge_index[last] = position
+
+def estimate_stream(edges, reservoir_size, report_every=None, improved=False, seed=None):
+    """
+    Feed an edge stream through a TriestEstimator, yielding (edges_seen, transitivity estimate)
+    every report_every edges (if given) and once at the end of the stream.
+    """
+    estimator = TriestEstimator(reservoir_size, improved, seed)
+    reported = None
+    for u, v in edges:
+        estimator.update(u, v)
+        if report_every and estimator.edges_seen % report_every == 0 and estimator.edges_seen != reported:
+            reported = estimator.edges_seen
+            yield reported, estimator.transitivity()
+    if estimator.edges_seen != reported:
+        yield estimator.edges_seen, estimator.transitivity()
@@ -1,5 +1,15 @@
 import random
-import networkx as nx
+from edgelist import load_edge_list, edge_chunks
+
+def stream_edges(graph_file):
+    """
+    Yield the edges of an edge list one at a time (original node ids), reading fixed-size chunks
+    from the memory-mapped binary cache so only one chunk is held in memory. Each undirected edge
+    is yielded once, at its first occurrence, as networkx's Graph loading did.
+    """
+    edges = load_edge_list(graph_file, unique=True)
+    for src, dst in edge_chunks(edges):
+        yield from zip(edges.node_ids[src].tolist(), edges.node_ids[dst].tolist())
 
 def reservoir_sampling(stream, k):
     
@@ -13,27 +23,54 @@ def reservoir_sampling(stream, k):
                 reservoir[j] = edge
     return reservoir
 
-def count_wedges_and_closed_wedges(reservoir):
-   
-    subgraph = nx.Graph()
-    subgraph.add_edges_from(reservoir)
-
-    wedge_count = 0
-    closed_wedge_count = 0
-
-    for node in subgraph.nodes():
-        neighbors = list(subgraph.neighbors(node))
-        num_neighbors = len(neighbors)
-        if num_neighbors < 2:
-            continue
-        wedges = [(neighbors[i], neighbors[j]) for i in range(num_neighbors) for j in range(i + 1, num_neighbors)]
-        wedge_count += len(wedges)
-        for u, v in wedges:
-            if subgraph.has_edge(u, v):
-                closed_wedge_count += 1
+def count_wedges_and_closed_wedges(reservoir, method='sets'):
+    """
+    Count the wedges (pairs of neighbours of a node) and closed wedges (such pairs that are also
+    joined by an edge) of the graph formed by the reservoir edges.
+    Wedges are computed in closed form as sum(C(deg, 2)); closed wedges are 3 per triangle, and
+    triangles are counted by degree-ordered neighbour intersection ('sets') or with sparse matrix
+    products ('sparse', needs scipy). A self-loop makes a node its own neighbour, as in networkx.
+    """
+    if method not in ('sets', 'sparse'):
+        raise ValueError(f"Unknown triangle counting method: {method}")
+    adjacency = {}
+    for u, v in reservoir:
+        adjacency.setdefault(u, set()).add(v)
+        adjacency.setdefault(v, set()).add(u)
 
+    wedge_count = sum(len(neighbors) * (len(neighbors) - 1) // 2 for neighbors in adjacency.values())
+    loops = [node for node, neighbors in adjacency.items() if node in neighbors]
+    for node in loops:
+        adjacency[node].discard(node)
+    triangles = _count_triangles_sparse(adjacency) if method == 'sparse' else _count_triangles(adjacency)
+    # A looped node also closes the wedge (itself, v) for each of its other neighbours v
+    closed_wedge_count = 3 * triangles + sum(len(adjacency[node]) for node in loops)
     return wedge_count, closed_wedge_count
 
+def _count_triangles(adjacency):
+    """Triangles of a loop-free adjacency map, each found once from its lowest-ranked vertex."""
+    rank = {node: position for position, node in
+            enumerate(sorted(adjacency, key=lambda node: (len(adjacency[node]), node)))}
+    # Orient every edge towards the higher-ranked endpoint; out-degrees are then O(sqrt(edges))
+    forward = {node: {v for v in neighbors if rank[v] > rank[node]} for node, neighbors in adjacency.items()}
+    triangles = 0
+    for node, out in forward.items():
+        for v in out:
+            out_v = forward[v]
+            triangles += len(out & out_v) if len(out) < len(out_v) else len(out_v & out)
+    return triangles
+
+def _count_triangles_sparse(adjacency):
+    """Triangles of a loop-free adjacency map as sum((A @ A) * A) / 6 with scipy sparse matrices."""
+    import numpy as np
+    from scipy import sparse
+
+    index = {node: position for position, node in enumerate(adjacency)}
+    rows = np.fromiter((index[u] for u, neighbors in adjacency.items() for _ in neighbors), dtype=np.int64)
+    cols = np.fromiter((index[v] for neighbors in adjacency.values() for v in neighbors), dtype=np.int64)
+    matrix = sparse.csr_matrix((np.ones(len(rows), dtype=np.int64), (rows, cols)), shape=(len(index), len(index)))
+    return int((matrix @ matrix).multiply(matrix).sum()) // 6
+
 def estimate_transitivity(wedge_count, closed_wedge_count):
     
     if wedge_count == 0:
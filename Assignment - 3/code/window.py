@@ -0,0 +1,118 @@
+import random
+from collections import deque, namedtuple
+
+WindowSnapshot = namedtuple('WindowSnapshot', ['edges_seen', 'timestamp', 'window_edges', 'triangles', 'wedges',
+                                               'transitivity'])
+
+class WindowedTransitivity:
+    """
+    Transitivity of the most recent part of an edge stream: the last window_edges edges and/or the
+    edges of the last window_seconds. Edges are added as they arrive and expired in arrival order;
+    every insertion and expiry updates the window's wedge count (deg(u) + deg(v) wedges gained or
+    lost) and triangle count (common neighbours of u and v), so an estimate is O(1) at any time.
+    With sample_probability < 1 only that fraction of edges is kept (memory shrinks accordingly)
+    and the counts are scaled by 1/p^2 for wedges and 1/p^3 for triangles; with 1 they are exact.
+    An edge repeated inside the window is kept once until its last copy expires.
+    """
+    def __init__(self, window_edges=None, window_seconds=None, sample_probability=1.0, seed=None):
+        if window_edges is None and window_seconds is None:
+            raise ValueError("Give window_edges and/or window_seconds")
+        if not 0.0 < sample_probability <= 1.0:
+            raise ValueError("sample_probability must be in (0, 1]")
+        self.window_edges = window_edges
+        self.window_seconds = window_seconds
+        self.sample_probability = sample_probability
+        self.random = random.Random(seed)
+        self.adjacency = {}
+        self.multiplicity = {}  # Copies of each edge currently in the window
+        self.window = deque()  # (stream position, timestamp, edge) in arrival order
+        self.edges_seen = 0
+        self.timestamp = None
+        self.triangles = 0
+        self.wedges = 0
+
+    def update(self, u, v, timestamp=None):
+        """Add one stream edge (timestamp defaults to its position) and expire what left the window."""
+        if u == v:
+            return
+        self.edges_seen += 1
+        self.timestamp = self.edges_seen if timestamp is None else timestamp
+        if self.sample_probability == 1.0 or self.random.random() < self.sample_probability:
+            edge = (u, v) if u < v else (v, u)
+            self.window.append((self.edges_seen, self.timestamp, edge))
+            if self.multiplicity.get(edge, 0) == 0:
+                self._add(edge)
+            self.multiplicity[edge] = self.multiplicity.get(edge, 0) + 1
+        self._expire()
+
+    def _expire(self):
+        window = self.window
+        while window and ((self.window_edges is not None and window[0][0] <= self.edges_seen - self.window_edges) or
+                          (self.window_seconds is not None and window[0][1] <= self.timestamp - self.window_seconds)):
+            edge = window.popleft()[2]
+            self.multiplicity[edge] -= 1
+            if not self.multiplicity[edge]:
+                del self.multiplicity[edge]
+                self._remove(edge)
+
+    def _common_neighbors(self, u, v):
+        first, second = self.adjacency.get(u, ()), self.adjacency.get(v, ())
+        if len(first) > len(second):
+            first, second = second, first
+        return sum(1 for node in first if node in second)
+
+    def _add(self, edge):
+        u, v = edge
+        self.triangles += self._common_neighbors(u, v)
+        self.wedges += len(self.adjacency.get(u, ())) + len(self.adjacency.get(v, ()))
+        self.adjacency.setdefault(u, set()).add(v)
+        self.adjacency.setdefault(v, set()).add(u)
+
+    def _remove(self, edge):
+        u, v = edge
+        for a, b in ((u, v), (v, u)):
+            neighbors = self.adjacency[a]
+            neighbors.discard(b)
+            if not neighbors:
+                del self.adjacency[a]
+        self.triangles -= self._common_neighbors(u, v)
+        self.wedges -= len(self.adjacency.get(u, ())) + len(self.adjacency.get(v, ()))
+
+    def triangle_estimate(self):
+        return self.triangles / self.sample_probability ** 3
+
+    def wedge_estimate(self):
+        return self.wedges / self.sample_probability ** 2
+
+    def transitivity(self):
+        """Transitivity of the current window: 3 * triangles / wedges."""
+        return 3 * self.triangle_estimate() / self.wedge_estimate() if self.wedges else 0.0
+
+    def snapshot(self):
+        return WindowSnapshot(self.edges_seen, self.timestamp, len(self.window), self.triangle_estimate(),
+                              self.wedge_estimate(), self.transitivity())
+
+def monitor(edges, window_edges=None, window_seconds=None, report_every=None, report_seconds=None,
+            sample_probability=1.0, seed=None, callback=None):
+    """
+    Track windowed transitivity over a stream of (u, v) or (u, v, timestamp) edges, yielding a
+    WindowSnapshot every report_every edges and/or report_seconds of stream time (and passing it
+    to callback, if given).
+    """
+    tracker = WindowedTransitivity(window_edges, window_seconds, sample_probability, seed)
+    next_report_time, reported = None, 0
+    for edge in edges:
+        tracker.update(*edge)
+        due = bool(report_every) and tracker.edges_seen % report_every == 0 and tracker.edges_seen != reported
+        if report_seconds is not None and tracker.timestamp is not None:
+            if next_report_time is None:
+                next_report_time = tracker.timestamp + report_seconds
+            elif tracker.timestamp >= next_report_time:
+                next_report_time = tracker.timestamp + report_seconds
+                due = True
+        if due:
+            reported = tracker.edges_seen
+            snapshot = tracker.snapshot()
+            if callback is not None:
+                callback(snapshot)
+            yield snapshot
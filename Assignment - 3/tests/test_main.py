@@ -1,5 +1,13 @@
+import os
+import tempfile
 import unittest
-from utils import reservoir_sampling, count_wedges_and_closed_wedges, estimate_transitivity
+import networkx as nx
+import numpy as np
+from utils import stream_edges, reservoir_sampling, count_wedges_and_closed_wedges, estimate_transitivity
+from triest import TriestEstimator
+from experiments import run_experiments
+from edgelist import load_edge_list, iter_edge_chunks
+from window import WindowedTransitivity, monitor
 
 class TestUtils(unittest.TestCase):
     def test_reservoir_sampling(self):
@@ -25,6 +33,17 @@ class TestUtils(unittest.TestCase):
         # Expected closed wedges: (1-2-3)
         self.assertEqual(closed_wedge_count, 1)
 
+    def test_wedge_counts_match_graph(self):
+        """
+        Test the closed-form wedge count and both triangle counting methods against networkx.
+        """
+        graph = nx.gnm_random_graph(80, 600, seed=3)
+        wedges = sum(degree * (degree - 1) // 2 for _, degree in graph.degree())
+        closed_wedges = sum(nx.triangles(graph).values())  # Each triangle closes 3 wedges
+        for method in ("sets", "sparse"):
+            self.assertEqual(count_wedges_and_closed_wedges(list(graph.edges()), method=method),
+                             (wedges, closed_wedges))
+
     def test_estimate_transitivity(self):
         """
         Test the transitivity estimation function.
@@ -39,5 +58,110 @@ class TestUtils(unittest.TestCase):
         transitivity = estimate_transitivity(wedge_count, closed_wedge_count)
         self.assertEqual(transitivity, 0.0)  # Edge case: No wedges, transitivity should be 0
 
+    def test_triest_exact_when_stream_fits_in_reservoir(self):
+        """
+        Test that the streaming estimator is exact while every edge fits in the reservoir.
+        """
+        graph = nx.gnm_random_graph(60, 300, seed=1)
+        for improved in (False, True):
+            estimator = TriestEstimator(1000, improved=improved, seed=0).update_many(graph.edges())
+            self.assertAlmostEqual(estimator.triangle_estimate(), sum(nx.triangles(graph).values()) / 3)
+            self.assertAlmostEqual(estimator.transitivity(), nx.transitivity(graph))
+
+    def test_triest_reservoir_is_bounded(self):
+        """
+        Test that the reservoir never holds more than its size and stays consistent with its adjacency.
+        """
+        graph = nx.gnm_random_graph(200, 2000, seed=2)
+        estimator = TriestEstimator(100, seed=0).update_many(graph.edges())
+        self.assertEqual(estimator.edges_seen, 2000)
+        self.assertEqual(len(estimator.edges), 100)
+        self.assertEqual(sum(len(neighbors) for neighbors in estimator.adjacency.values()), 200)
+
+    def test_experiment_runner_with_cached_exact_transitivity(self):
+        """
+        Test that trials over a reservoir holding the whole stream reproduce the exact transitivity.
+        """
+        graph = nx.gnm_random_graph(50, 200, seed=4)
+        with tempfile.TemporaryDirectory() as directory:
+            graph_file = os.path.join(directory, "graph.txt")
+            nx.write_edgelist(graph, graph_file, data=False)
+            cache_path = os.path.join(directory, "exact.json")
+            results = run_experiments([graph_file], [100, 500], trials=3, workers=1, cache_path=cache_path)
+            self.assertTrue(os.path.exists(cache_path))
+        self.assertEqual([result["reservoir_size"] for result in results], [100, 500])
+        exact = nx.transitivity(graph)
+        self.assertAlmostEqual(results[0]["exact"], exact)
+        self.assertAlmostEqual(results[1]["mean"], exact)
+        self.assertLessEqual(results[0]["ci_low"], results[0]["mean"])
+        self.assertLessEqual(results[0]["mean"], results[0]["ci_high"])
+
+    def test_edge_list_cache(self):
+        """
+        Test bulk parsing of whitespace and comma edge lists, dense remapping and cache invalidation.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            spaces = os.path.join(directory, "spaces.txt")
+            commas = os.path.join(directory, "commas.dat")
+            with open(spaces, "w") as file:
+                file.write("# comment\n10 20\n20 30\n10 30\n")
+            with open(commas, "w") as file:
+                file.write("1,2,0.5\n2,3,1.5")
+            edges = load_edge_list(spaces)
+            self.assertEqual(edges.node_ids.tolist(), [10, 20, 30])
+            self.assertEqual(list(zip(edges.src.tolist(), edges.dst.tolist())), [(0, 1), (1, 2), (0, 2)])
+            self.assertIsNone(edges.weights)
+            self.assertEqual(load_edge_list(commas).weights.tolist(), [0.5, 1.5])
+            # The second load comes from the memory-mapped cache
+            self.assertEqual(load_edge_list(spaces).dst.tolist(), edges.dst.tolist())
+            self.assertEqual(sum(len(src) for src, _ in iter_edge_chunks(spaces, chunk_size=2)), 3)
+            # Changing the source rebuilds the cache
+            with open(spaces, "a") as file:
+                file.write("30 40\n")
+            self.assertEqual(load_edge_list(spaces).node_ids.tolist(), [10, 20, 30, 40])
+
+    def test_duplicate_edges_streamed_once(self):
+        """
+        Test that reciprocal and repeated edges are dropped on load, keeping their first occurrence.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "directed.txt")
+            with open(path, "w") as file:
+                file.write("1 2\n2 3\n2 1\n3 1\n2 3\n3 4\n")
+            self.assertEqual(len(load_edge_list(path).src), 6)
+            self.assertEqual(len(load_edge_list(path, unique=True).src), 4)
+            self.assertEqual(list(stream_edges(path)), [(1, 2), (2, 3), (3, 1), (3, 4)])
+            # The deduplicated endpoints come from the cache too, memory-mapped rather than recomputed
+            self.assertIsInstance(load_edge_list(path, unique=True).src, np.memmap)
+            self.assertEqual([len(src) for src, _ in iter_edge_chunks(path, chunk_size=3, unique=True)], [3, 1])
+            self.assertEqual(len(load_edge_list(path, cache=False, unique=True).src), 4)
+
+    def test_windowed_transitivity_matches_window_graph(self):
+        """
+        Test that the sliding-window counts equal the exact transitivity of the last N edges.
+        """
+        stream = list(nx.gnm_random_graph(40, 400, seed=5).edges())
+        stream += stream[:50]  # Edges that come back while an earlier copy may still be in the window
+        window_edges = 120
+        snapshots = list(monitor(stream, window_edges=window_edges, report_every=30))
+        self.assertEqual([snapshot.edges_seen for snapshot in snapshots], list(range(30, len(stream) + 1, 30)))
+        for snapshot in snapshots:
+            window_graph = nx.Graph(stream[snapshot.edges_seen - window_edges:snapshot.edges_seen]
+                                    if snapshot.edges_seen >= window_edges else stream[:snapshot.edges_seen])
+            self.assertAlmostEqual(snapshot.transitivity, nx.transitivity(window_graph))
+            self.assertEqual(snapshot.triangles, sum(nx.triangles(window_graph).values()) / 3)
+
+    def test_time_window_expires_old_edges(self):
+        """
+        Test that edges older than window_seconds leave the window.
+        """
+        tracker = WindowedTransitivity(window_seconds=10)
+        for u, v, timestamp in [(1, 2, 0), (2, 3, 1), (1, 3, 2)]:
+            tracker.update(u, v, timestamp)
+        self.assertAlmostEqual(tracker.transitivity(), 1.0)
+        tracker.update(3, 4, 10.5)  # (1, 2) at t=0 has expired
+        self.assertEqual(tracker.triangles, 0)
+        self.assertEqual(len(tracker.window), 3)
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,3 +1,5 @@
+import os
+import sys
 import numpy as np
 from scipy.linalg import eigh
 import matplotlib
@@ -5,27 +7,26 @@ matplotlib.use('Agg')  # Use non-interactive backend
 import matplotlib.pyplot as plt
 import networkx as nx
 from sklearn.cluster import KMeans
+# The edge-list loader lives in Assignment 3 (code/edgelist.py) and is shared from there
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Assignment - 3', 'code'))
+from edgelist import load_edge_list
 
 # Step 1: Load and Parse the Dataset
 def load_edges(file_path, weighted=False):
-    edges = []
-    weights = []
-    with open(file_path, 'r') as file:
-        for line in file:
-            values = line.strip().split(',')
-            node1, node2 = int(values[0]), int(values[1])
-            edges.append((node1, node2))
-            if weighted and len(values) == 3:
-                weights.append(float(values[2]))
-    return (edges, weights) if weighted else edges
+    edge_list = load_edge_list(file_path)  # Parsed in bulk, memory-mapped from the cache on later runs
+    edges = np.column_stack((edge_list.node_ids[edge_list.src], edge_list.node_ids[edge_list.dst]))
+    if not weighted:
+        return edges
+    weights = np.asarray(edge_list.weights) if edge_list.weights is not None else np.zeros(0)
+    return edges, weights
 
 
 # Step 2: Create Adjacency Matrix
 def create_adjacency_matrix(edges, n_nodes):
     A = np.zeros((n_nodes, n_nodes))
-    for node1, node2 in edges:
-        A[node1 - 1, node2 - 1] = 1
-        A[node2 - 1, node1 - 1] = 1  # For undirected graphs
+    edges = np.asarray(edges).reshape(-1, 2)
+    A[edges[:, 0] - 1, edges[:, 1] - 1] = 1
+    A[edges[:, 1] - 1, edges[:, 0] - 1] = 1  # For undirected graphs
     return A
 
 
@@ -55,7 +56,7 @@ def spectral_clustering(L, k):
 # Step 6: Visualization Functions
 def visualize_graph(edges, labels, n_nodes, output_file):
     G = nx.Graph()
-    G.add_edges_from(edges)
+    G.add_edges_from(np.asarray(edges).tolist())
     pos = nx.spring_layout(G)
     color_map = [labels[node - 1] for node in range(1, n_nodes + 1)]
     nx.draw(G, pos, node_color=color_map, with_labels=True, cmap=plt.cm.rainbow)
@@ -102,8 +103,8 @@ if __name__ == "__main__":
     edges2 = load_edges(file2_path)
 
     # Determine the number of nodes
-    n_nodes1 = max(max(e) for e in edges1)
-    n_nodes2 = max(max(e) for e in edges2)
+    n_nodes1 = int(edges1.max())
+    n_nodes2 = int(edges2.max())
 
     # Create adjacency matrices
     A1 = create_adjacency_matrix(edges1, n_nodes1)